@@ -0,0 +1,14 @@
+from django.urls import path
+from . import views
+
+# Mounted under api/ by invoice_processor.urls
+urlpatterns = [
+    path('check-gst-cache/', views.check_gst_cache, name='check_gst_cache'),
+    path('request-captcha/', views.request_captcha, name='request_captcha'),
+    path('verify-gst/', views.verify_gst, name='verify_gst'),
+    path('refresh-gst-cache/', views.refresh_gst_cache_entry, name='refresh_gst_cache_entry'),
+    path('bulk-upload/', views.bulk_upload_invoices, name='bulk_upload_invoices'),
+    path('batch-status/<str:batch_id>/', views.get_batch_status, name='get_batch_status'),
+    path('dashboard-analytics/', views.dashboard_analytics_api, name='dashboard_analytics_api'),
+    path('delete-profile-picture/', views.delete_profile_picture, name='delete_profile_picture'),
+]
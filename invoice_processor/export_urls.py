@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+# Mounted under export/ by invoice_processor.urls
+urlpatterns = [
+    path('invoices/', views.export_invoices, name='export_invoices'),
+    path('gst-cache/', views.export_gst_cache, name='export_gst_cache'),
+    path('my-data/', views.export_my_data, name='export_my_data'),
+]
@@ -3,6 +3,14 @@ from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 import os
+import re
+
+
+# GSTIN format: state code, PAN, entity number, 'Z', checksum
+_GSTIN_RE = re.compile(r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$')
+
+# Separators stripped from phone numbers before the digits-only check
+_PHONE_SEPARATORS = str.maketrans('', '', '- ()')
 
 
 class CustomAuthenticationForm(AuthenticationForm):
@@ -202,9 +210,7 @@ class ManualInvoiceEntryForm(forms.Form):
         """Validate vendor GSTIN format"""
         gstin = self.cleaned_data.get('vendor_gstin', '').strip().upper()
         if gstin:
-            import re
-            pattern = r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$'
-            if not re.match(pattern, gstin):
+            if not _GSTIN_RE.match(gstin):
                 raise ValidationError('Invalid GSTIN format. Must be 15 characters (e.g., 22AAAAA0000A1Z5)')
         return gstin
     
@@ -212,9 +218,7 @@ class ManualInvoiceEntryForm(forms.Form):
         """Validate billed company GSTIN format"""
         gstin = self.cleaned_data.get('billed_company_gstin', '').strip().upper()
         if gstin:
-            import re
-            pattern = r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$'
-            if not re.match(pattern, gstin):
+            if not _GSTIN_RE.match(gstin):
                 raise ValidationError('Invalid GSTIN format. Must be 15 characters (e.g., 22AAAAA0000A1Z5)')
         return gstin
     
@@ -402,7 +406,7 @@ class UserProfileForm(forms.Form):
         phone = self.cleaned_data.get('phone_number', '').strip()
         if phone:
             # Remove common separators
-            phone = phone.replace('-', '').replace(' ', '').replace('(', '').replace(')', '')
+            phone = phone.translate(_PHONE_SEPARATORS)
             # Basic validation - should contain only digits and optional + prefix
             if not phone.replace('+', '').isdigit():
                 raise ValidationError('Phone number should contain only digits and optional + prefix')
@@ -2,7 +2,7 @@
 Bulk Upload Handler Service
 
 This service manages multi-file invoice uploads and coordinates asynchronous processing.
-It creates batch records for tracking and queues individual invoice processing tasks.
+It creates batch records for tracking and queues processing tasks in small chunks.
 """
 
 import logging
@@ -10,9 +10,10 @@ from typing import List, Dict, Any
 from django.core.files.uploadedfile import UploadedFile
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import F
 
 from invoice_processor.models import Invoice, InvoiceBatch
-from invoice_processor.tasks import process_invoice_async
+from invoice_processor.tasks import process_invoice_batch_async
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +23,13 @@ class BulkUploadHandler:
     Handles bulk invoice uploads with asynchronous processing.
     
     This class manages the creation of invoice batches, saves uploaded files,
-    and queues individual invoice processing tasks for background execution.
+    and queues batch processing tasks for background execution.
     """
     
+    # Invoices per processing task; small chunks keep a large upload spread
+    # across workers and well inside the task time limit
+    TASK_CHUNK_SIZE = 5
+    
     def handle_bulk_upload(self, user: User, files: List[UploadedFile]) -> Dict[str, Any]:
         """
         Process multiple invoice files and queue them for asynchronous processing.
@@ -32,7 +37,7 @@ class BulkUploadHandler:
         This method:
         1. Creates an InvoiceBatch record for tracking
         2. Creates Invoice records for each file
-        3. Queues Celery tasks for asynchronous processing
+        3. Queues one Celery task per chunk of TASK_CHUNK_SIZE invoices
         4. Returns batch_id for status tracking
         
         Args:
@@ -71,8 +76,8 @@ class BulkUploadHandler:
                 
                 logger.info(f"Created batch {batch.batch_id} for user {user.username} with {len(files)} files")
                 
-                # Create Invoice records and queue processing tasks
-                queued_count = 0
+                # Create Invoice records, then queue them in chunks
+                invoice_ids = []
                 from datetime import date
                 
                 for file in files:
@@ -93,11 +98,7 @@ class BulkUploadHandler:
                             extraction_method='AI'
                         )
                         
-                        # Queue asynchronous processing task
-                        process_invoice_async.delay(invoice.id, str(batch.batch_id))
-                        queued_count += 1
-                        
-                        logger.info(f"Queued invoice {invoice.id} for processing in batch {batch.batch_id}")
+                        invoice_ids.append(invoice.id)
                         
                     except Exception as e:
                         logger.error(f"Failed to create invoice for file {file.name}: {str(e)}")
@@ -105,6 +106,23 @@ class BulkUploadHandler:
                         batch.failed_count += 1
                         batch.save(update_fields=['failed_count'])
                 
+                # Queue asynchronous processing tasks
+                queued_count = 0
+                for start in range(0, len(invoice_ids), self.TASK_CHUNK_SIZE):
+                    chunk = invoice_ids[start:start + self.TASK_CHUNK_SIZE]
+                    try:
+                        process_invoice_batch_async.delay(chunk, str(batch.batch_id))
+                        queued_count += len(chunk)
+                        
+                        logger.info(f"Queued invoices {chunk} for processing in batch {batch.batch_id}")
+                        
+                    except Exception as e:
+                        logger.error(f"Failed to queue invoices {chunk} for batch {batch.batch_id}: {str(e)}")
+                        # Earlier chunks may already be recording progress
+                        InvoiceBatch.objects.filter(pk=batch.pk).update(
+                            failed_count=F('failed_count') + len(chunk)
+                        )
+                
                 # Update batch status if all files failed
                 if queued_count == 0:
                     batch.status = 'PARTIAL_FAILURE'
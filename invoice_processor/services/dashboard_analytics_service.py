@@ -6,6 +6,7 @@ Generates data for charts, tables, and visualizations.
 """
 
 from django.db.models import Count, Sum, Q, F
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
@@ -41,34 +42,33 @@ class DashboardAnalyticsService:
             end_date = timezone.now().date()
             start_date = end_date - timedelta(days=days - 1)
             
+            # Count genuine (HEALTHY) and at-risk (REVIEW + AT_RISK) invoices
+            # for every day in the range with a single grouped query
+            daily_counts = Invoice.objects.filter(
+                uploaded_by=user,
+                uploaded_at__date__gte=start_date,
+                uploaded_at__date__lte=end_date
+            ).annotate(
+                day=TruncDate('uploaded_at')
+            ).values('day').annotate(
+                genuine=Count('id', filter=Q(health_score__status='HEALTHY')),
+                at_risk=Count('id', filter=Q(health_score__status__in=['REVIEW', 'AT_RISK']))
+            ).order_by('day')
+            counts_by_day = {row['day']: row for row in daily_counts}
+            
             # Initialize result structure
             dates = []
             genuine_counts = []
             at_risk_counts = []
             
-            # Query invoices for each day
+            # Fill in every day, including days without invoices
             for i in range(days):
                 current_date = start_date + timedelta(days=i)
                 dates.append(current_date.strftime('%d %b'))
                 
-                # Get invoices for this day
-                day_invoices = Invoice.objects.filter(
-                    uploaded_by=user,
-                    uploaded_at__date=current_date
-                ).select_related('health_score')
-                
-                # Count genuine (HEALTHY) invoices
-                genuine_count = day_invoices.filter(
-                    health_score__status='HEALTHY'
-                ).count()
-                
-                # Count at-risk (REVIEW + AT_RISK) invoices
-                at_risk_count = day_invoices.filter(
-                    health_score__status__in=['REVIEW', 'AT_RISK']
-                ).count()
-                
-                genuine_counts.append(genuine_count)
-                at_risk_counts.append(at_risk_count)
+                day_counts = counts_by_day.get(current_date, {})
+                genuine_counts.append(day_counts.get('genuine', 0))
+                at_risk_counts.append(day_counts.get('at_risk', 0))
             
             logger.info(f"Generated invoice per day data for {days} days")
             
@@ -11,8 +11,15 @@ from datetime import datetime
 from django.http import HttpResponse
 from io import StringIO
 
+from invoice_processor.models import Invoice
+
 logger = logging.getLogger(__name__)
 
+# Choice label lookups, resolved once instead of per row via get_FOO_display()
+_STATUS_MAP = dict(Invoice.STATUS_CHOICES)
+_GST_MAP = dict(Invoice.GST_VERIFICATION_CHOICES)
+_EXTRACTION_METHOD_MAP = dict(Invoice.EXTRACTION_METHOD_CHOICES)
+
 
 class DataExportService:
     """Service for exporting data to CSV format"""
@@ -51,7 +58,7 @@ class DataExportService:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         response['Content-Disposition'] = f'attachment; filename="invoices_export_{timestamp}.csv"'
         
-        writer = csv.writer(response)
+        writer = csv.writer(response, dialect='unix', quoting=csv.QUOTE_MINIMAL)
         
         # Write header row with formatted field names
         header = []
@@ -75,11 +82,11 @@ class DataExportService:
                 elif field == 'ai_confidence_score':
                     value = f"{invoice.ai_confidence_score:.2f}" if invoice.ai_confidence_score else ''
                 elif field == 'status':
-                    value = invoice.get_status_display()
+                    value = _STATUS_MAP.get(invoice.status, invoice.status)
                 elif field == 'gst_verification_status':
-                    value = invoice.get_gst_verification_status_display()
+                    value = _GST_MAP.get(invoice.gst_verification_status, invoice.gst_verification_status)
                 elif field == 'extraction_method':
-                    value = invoice.get_extraction_method_display()
+                    value = _EXTRACTION_METHOD_MAP.get(invoice.extraction_method, invoice.extraction_method)
                 else:
                     value = getattr(invoice, field, '')
                 
@@ -105,7 +112,7 @@ class DataExportService:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         response['Content-Disposition'] = f'attachment; filename="gst_cache_export_{timestamp}.csv"'
         
-        writer = csv.writer(response)
+        writer = csv.writer(response, dialect='unix', quoting=csv.QUOTE_MINIMAL)
         
         # Write header row
         header = [
@@ -155,7 +162,7 @@ class DataExportService:
         Returns:
             HttpResponse with CSV content containing all user data
         """
-        from invoice_processor.models import Invoice, UserProfile
+        from invoice_processor.models import UserProfile
         
         # Create CSV response
         response = HttpResponse(content_type='text/csv')
@@ -163,7 +170,7 @@ class DataExportService:
         response['Content-Disposition'] = f'attachment; filename="my_data_export_{timestamp}.csv"'
         
         output = StringIO()
-        writer = csv.writer(output)
+        writer = csv.writer(output, dialect='unix', quoting=csv.QUOTE_MINIMAL)
         
         # Section 1: User Profile Information
         writer.writerow(['=== USER PROFILE ==='])
@@ -219,9 +226,9 @@ class DataExportService:
                     invoice.vendor_gstin,
                     invoice.billed_company_gstin,
                     f"{invoice.grand_total:.2f}",
-                    invoice.get_status_display(),
-                    invoice.get_gst_verification_status_display(),
-                    invoice.get_extraction_method_display(),
+                    _STATUS_MAP.get(invoice.status, invoice.status),
+                    _GST_MAP.get(invoice.gst_verification_status, invoice.gst_verification_status),
+                    _EXTRACTION_METHOD_MAP.get(invoice.extraction_method, invoice.extraction_method),
                     f"{invoice.ai_confidence_score:.2f}" if invoice.ai_confidence_score else '',
                     invoice.uploaded_at.strftime('%Y-%m-%d %H:%M:%S')
                 ]
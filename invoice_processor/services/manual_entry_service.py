@@ -13,6 +13,9 @@ from typing import Dict, List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# Largest allowed difference between grand total and sum of line totals (1 rupee)
+ARITHMETIC_TOLERANCE = Decimal('1.00')
+
 
 class ManualEntryService:
     """Service for managing manual invoice data entry when AI extraction fails"""
@@ -224,19 +227,14 @@ class ManualEntryService:
             line_items = data.get('line_items', [])
             
             # Calculate sum of line totals
-            calculated_total = Decimal('0')
-            for item in line_items:
-                line_total = item.get('line_total')
-                if line_total is not None and line_total != '':
-                    try:
-                        calculated_total += Decimal(str(line_total))
-                    except (ValueError, InvalidOperation):
-                        # Skip invalid line totals (already caught in line item validation)
-                        pass
+            calculated_total = sum(
+                (self._parse_line_total(item.get('line_total')) for item in line_items),
+                Decimal('0')
+            )
             
             # Allow small rounding differences (up to 1 rupee)
             difference = abs(grand_total - calculated_total)
-            if difference > Decimal('1.00'):
+            if difference > ARITHMETIC_TOLERANCE:
                 errors.append(
                     f"Grand total (₹{grand_total}) does not match sum of line items (₹{calculated_total}). "
                     f"Difference: ₹{difference}"
@@ -249,6 +247,16 @@ class ManualEntryService:
         
         return errors
     
+    def _parse_line_total(self, line_total) -> Decimal:
+        """Parse a line total, treating missing or invalid values as zero"""
+        if line_total is None or line_total == '':
+            return Decimal('0')
+        try:
+            return Decimal(str(line_total))
+        except (ValueError, InvalidOperation):
+            # Invalid line totals are already caught in line item validation
+            return Decimal('0')
+    
     def _validate_gstin_format(self, gstin: str) -> bool:
         """
         Validate GSTIN format
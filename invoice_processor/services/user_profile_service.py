@@ -37,11 +37,19 @@ class UserProfileService:
         """
         from invoice_processor.models import UserProfile
         
+        # Reuse the profile already loaded on this user instance
+        try:
+            return user.profile
+        except UserProfile.DoesNotExist:
+            pass
+        
         profile, created = UserProfile.objects.get_or_create(user=user)
         
         if created:
             logger.info(f"Created new profile for user {user.username}")
         
+        # Cache on the user so templates and later calls skip the lookup
+        user.profile = profile
         return profile
     
     def update_profile(self, user: User, **kwargs) -> Tuple[bool, Optional[str]]:
@@ -65,11 +73,15 @@ class UserProfileService:
                 'enable_sound_effects', 'enable_animations', 'enable_notifications'
             ]
             
+            updated_fields = []
             for field, value in kwargs.items():
                 if field in allowed_fields:
                     setattr(profile, field, value)
+                    updated_fields.append(field)
             
-            profile.save()
+            # Write only the given fields; the profile may be a copy cached on
+            # the user before other fields changed
+            profile.save(update_fields=[*updated_fields, 'updated_at'])
             logger.info(f"Updated profile for user {user.username}")
             
             return True, None
@@ -180,13 +192,12 @@ class UserProfileService:
             
             # Delete old profile picture if exists
             if profile.profile_picture:
-                old_path = profile.profile_picture.path
-                if os.path.exists(old_path):
-                    try:
-                        os.remove(old_path)
-                        logger.info(f"Deleted old profile picture: {old_path}")
-                    except Exception as e:
-                        logger.warning(f"Could not delete old profile picture: {str(e)}")
+                old_name = profile.profile_picture.name
+                try:
+                    profile.profile_picture.delete(save=False)
+                    logger.info(f"Deleted old profile picture: {old_name}")
+                except Exception as e:
+                    logger.warning(f"Could not delete old profile picture: {str(e)}")
             
             # Optimize image before saving
             optimized_image = self._optimize_image(image_file)
@@ -195,8 +206,9 @@ class UserProfileService:
             file_extension = os.path.splitext(image_file.name)[1].lower()
             filename = f"user_{user.id}_profile{file_extension}"
             
-            # Save new profile picture
-            profile.profile_picture.save(filename, optimized_image, save=True)
+            # Save new profile picture, writing only that column
+            profile.profile_picture.save(filename, optimized_image, save=False)
+            profile.save(update_fields=['profile_picture', 'updated_at'])
             
             logger.info(f"Uploaded profile picture for user {user.username}")
             
@@ -262,9 +274,7 @@ class UserProfileService:
             
             if profile.profile_picture:
                 # Delete file from storage
-                old_path = profile.profile_picture.path
-                if os.path.exists(old_path):
-                    os.remove(old_path)
+                profile.profile_picture.delete(save=False)
                 
                 # Clear database field
                 profile.profile_picture = None
@@ -0,0 +1,35 @@
+"""
+Shared fixtures and settings overrides for the invoice_processor test modules
+"""
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+# Test users only need a password that round-trips; skip PBKDF2's iterations
+FAST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Keep uploaded files in memory instead of writing them under MEDIA_ROOT
+IN_MEMORY_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Pre-encoded 1x1 white RGB PNG; uploads only need a valid image, not PIL output
+MINIMAL_PNG = (
+    b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01'
+    b'\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDATx\x9cc\xf8\xff\xff?'
+    b'\x00\x05\xfe\x02\xfe\r\xefF\xb8\x00\x00\x00\x00IEND\xaeB`\x82'
+)
+
+
+def make_png_upload(name):
+    """Wrap the minimal PNG in an uploaded file with the given name"""
+    return SimpleUploadedFile(name, MINIMAL_PNG, content_type='image/png')
+
+
+def use_in_memory_storage(test_case):
+    """Give one test its own empty in-memory file storage for its duration"""
+    # A class-level override would share one storage instance between tests
+    storage_override = override_settings(STORAGES=IN_MEMORY_STORAGES)
+    storage_override.enable()
+    test_case.addCleanup(storage_override.disable)
@@ -20,6 +20,8 @@ from io import BytesIO
 from PIL import Image
 from unittest.mock import patch, Mock, MagicMock
 
+from celery.exceptions import Retry
+
 from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
@@ -28,7 +30,8 @@ from django.db import transaction
 
 from invoice_processor.models import Invoice, InvoiceBatch, LineItem, ComplianceFlag, InvoiceHealthScore
 from invoice_processor.services.bulk_upload_handler import bulk_upload_handler
-from invoice_processor.tasks import process_invoice_async
+from invoice_processor.tasks import process_invoice_async, process_invoice_batch_async
+from invoice_processor.testing import FAST_PASSWORD_HASHERS, make_png_upload, use_in_memory_storage
 
 
 # Use in-memory broker for testing
@@ -639,3 +642,154 @@ class BulkUploadIntegrationTests(TestCase):
         self.assertIn(invoice2, batch.invoices.all())
         self.assertEqual(invoice1.batch, batch)
         self.assertEqual(invoice2.batch, batch)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class BatchTaskProcessingTests(TestCase):
+    """Tests for process_invoice_batch_async and how bulk uploads queue it"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures shared by all tests"""
+        cls.user = User.objects.create_user(
+            username='batchuser',
+            email='batch@example.com',
+            password='testpass123'
+        )
+    
+    def setUp(self):
+        """Set up per-test file storage"""
+        use_in_memory_storage(self)
+    
+    def _create_batch(self, total_files):
+        """Create a processing batch with one pending invoice per file"""
+        batch = InvoiceBatch.objects.create(
+            user=self.user,
+            total_files=total_files,
+            processed_count=0,
+            failed_count=0,
+            status='PROCESSING'
+        )
+        invoice_ids = [
+            Invoice.objects.create(
+                invoice_id='PENDING',
+                invoice_date=datetime.now().date(),
+                vendor_name='Processing...',
+                grand_total=0,
+                status='PENDING_ANALYSIS',
+                uploaded_by=self.user,
+                file_path=make_png_upload(f'batch_{index}.png'),
+                batch=batch,
+                extraction_method='AI'
+            ).id
+            for index in range(total_files)
+        ]
+        return batch, invoice_ids
+    
+    def _pipeline_raising_for(self, failing_ids):
+        """Stand-in pipeline that raises for the given invoices and succeeds otherwise"""
+        def run_pipeline(invoice):
+            if invoice.id in failing_ids:
+                raise ValueError('Invoice data update failed')
+            return {'status': 'success', 'invoice_id': invoice.id}
+        return run_pipeline
+    
+    def test_batch_task_records_progress_after_each_invoice(self):
+        """Test that batch progress moves as each invoice settles"""
+        batch, invoice_ids = self._create_batch(3)
+        outcomes = iter(['success', 'failed', 'success'])
+        progress_seen = []
+        
+        def run_pipeline(invoice):
+            counts = InvoiceBatch.objects.values_list('processed_count', 'failed_count').get(pk=batch.pk)
+            progress_seen.append(counts)
+            return {'status': next(outcomes), 'invoice_id': invoice.id}
+        
+        with patch('invoice_processor.tasks._run_invoice_pipeline', side_effect=run_pipeline):
+            result = process_invoice_batch_async(invoice_ids, str(batch.batch_id))
+        
+        self.assertEqual(progress_seen, [(0, 0), (1, 0), (1, 1)])
+        self.assertEqual(result['status'], 'partial_failure')
+        self.assertEqual(result['processed_count'], 2)
+        self.assertEqual(result['failed_count'], 1)
+        
+        batch.refresh_from_db()
+        self.assertEqual(batch.processed_count, 2)
+        self.assertEqual(batch.failed_count, 1)
+        self.assertEqual(batch.status, 'PARTIAL_FAILURE')
+    
+    def test_batch_task_retries_only_invoices_that_raised(self):
+        """Test that a retry carries only the invoices whose processing raised"""
+        batch, invoice_ids = self._create_batch(3)
+        pipeline = self._pipeline_raising_for({invoice_ids[1]})
+        
+        with patch('invoice_processor.tasks._run_invoice_pipeline', side_effect=pipeline), \
+                patch.object(process_invoice_batch_async, 'retry', side_effect=Retry()) as mock_retry:
+            with self.assertRaises(Retry):
+                process_invoice_batch_async(invoice_ids, str(batch.batch_id))
+        
+        mock_retry.assert_called_once_with(
+            args=[[invoice_ids[1]], str(batch.batch_id)],
+            countdown=60
+        )
+        
+        # The invoice awaiting its retry is not counted yet
+        batch.refresh_from_db()
+        self.assertEqual(batch.processed_count, 2)
+        self.assertEqual(batch.failed_count, 0)
+        self.assertEqual(batch.status, 'PROCESSING')
+    
+    def test_batch_task_counts_failure_once_retries_run_out(self):
+        """Test that an invoice still raising on the last retry is counted as failed"""
+        batch, invoice_ids = self._create_batch(3)
+        pipeline = self._pipeline_raising_for({invoice_ids[1]})
+        
+        with patch('invoice_processor.tasks._run_invoice_pipeline', side_effect=pipeline), \
+                patch.object(process_invoice_batch_async, 'retry') as mock_retry:
+            result = process_invoice_batch_async.apply(
+                args=[invoice_ids, str(batch.batch_id)],
+                retries=process_invoice_batch_async.max_retries
+            ).get()
+        
+        mock_retry.assert_not_called()
+        self.assertEqual(result['status'], 'partial_failure')
+        self.assertEqual(result['processed_count'], 2)
+        self.assertEqual(result['failed_count'], 1)
+        
+        batch.refresh_from_db()
+        self.assertEqual(batch.processed_count, 2)
+        self.assertEqual(batch.failed_count, 1)
+        self.assertEqual(batch.status, 'PARTIAL_FAILURE')
+    
+    def test_bulk_upload_queues_invoices_in_chunks(self):
+        """Test that a bulk upload queues one task per chunk of invoices"""
+        chunk_size = bulk_upload_handler.TASK_CHUNK_SIZE
+        files = [make_png_upload(f'upload_{index}.png') for index in range(chunk_size + 1)]
+        
+        with patch('invoice_processor.services.bulk_upload_handler.process_invoice_batch_async') as mock_task:
+            result = bulk_upload_handler.handle_bulk_upload(self.user, files)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(result['queued_files'], chunk_size + 1)
+        
+        invoice_ids = list(
+            Invoice.objects.filter(batch__batch_id=result['batch_id']).order_by('id').values_list('id', flat=True)
+        )
+        queued_chunks = [call.args[0] for call in mock_task.delay.call_args_list]
+        self.assertEqual(queued_chunks, [invoice_ids[:chunk_size], invoice_ids[chunk_size:]])
+    
+    def test_bulk_upload_counts_unqueued_invoices_as_failed(self):
+        """Test that invoices whose task cannot be queued are counted as failed"""
+        files = [make_png_upload(f'upload_{index}.png') for index in range(3)]
+        
+        with patch('invoice_processor.services.bulk_upload_handler.process_invoice_batch_async') as mock_task:
+            mock_task.delay.side_effect = ConnectionError('Broker unavailable')
+            result = bulk_upload_handler.handle_bulk_upload(self.user, files)
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_code'], 'ALL_FILES_FAILED')
+        
+        batch = InvoiceBatch.objects.get(batch_id=result['batch_id'])
+        self.assertEqual(batch.processed_count, 0)
+        self.assertEqual(batch.failed_count, 3)
+        self.assertEqual(batch.status, 'PARTIAL_FAILURE')
@@ -158,6 +158,15 @@ class DataExportServiceTests(TestCase):
         # Should only have header row
         self.assertEqual(len(rows), 1)
     
+    def test_export_invoices_uses_lf_line_endings(self):
+        """Test that CSV rows are terminated with LF only"""
+        queryset = Invoice.objects.filter(uploaded_by=self.user)
+        response = self.service.export_invoices_to_csv(queryset)
+        
+        content = response.content.decode('utf-8')
+        self.assertNotIn('\r', content)
+        self.assertEqual(content.count('\n'), 3)  # Header + 2 invoices
+    
     def test_export_gst_cache_to_csv_generates_valid_csv(self):
         """Test that GST cache export generates valid CSV"""
         response = self.service.export_gst_cache_to_csv()
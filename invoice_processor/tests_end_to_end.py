@@ -11,45 +11,54 @@ This test suite performs comprehensive end-to-end testing of all Phase 2 feature
 Requirements tested: All Phase 2 requirements
 """
 
-import os
+import csv
+import io
 import time
 from decimal import Decimal
 from datetime import datetime, date, timedelta
-from io import BytesIO
-from PIL import Image
-from unittest.mock import patch, Mock
 
 from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 
 from invoice_processor.models import (
     Invoice, InvoiceBatch, LineItem, ComplianceFlag, 
     InvoiceHealthScore, GSTCacheEntry, UserProfile
 )
+from invoice_processor.services import gemini_service, analysis_engine
 from invoice_processor.services.bulk_upload_handler import bulk_upload_handler
-from invoice_processor.tasks import process_invoice_async
+from invoice_processor.tasks import process_invoice_batch_async
+from invoice_processor.testing import (
+    FAST_PASSWORD_HASHERS,
+    make_png_upload,
+    use_in_memory_storage,
+)
 
 
 @override_settings(
     CELERY_TASK_ALWAYS_EAGER=True,
     CELERY_TASK_EAGER_PROPAGATES=True,
+    PASSWORD_HASHERS=FAST_PASSWORD_HASHERS,
 )
 class EndToEndBulkUploadWorkflowTest(TestCase):
     """
     Test complete bulk upload workflow from file selection to completion
     """
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures shared by all tests"""
+        cls.user = User.objects.create_user(
             username='e2e_user',
             email='e2e@example.com',
             password='testpass123'
         )
+    
+    def setUp(self):
+        """Set up per-test client, file storage and service stubs"""
+        self.client = Client()
+        use_in_memory_storage(self)
         
         # Sample extracted data for successful processing
         self.sample_extracted_data = {
@@ -71,23 +80,27 @@ class EndToEndBulkUploadWorkflowTest(TestCase):
                 }
             ]
         }
+        
+        # Stub the extraction and compliance services by direct attribute
+        # assignment; the task imports them from their modules at call time
+        self._orig_extract = gemini_service.extract_data_from_image
+        self._orig_run_checks = analysis_engine.run_all_checks
+        self.extraction_results = []
+        gemini_service.extract_data_from_image = self._fake_extract
+        analysis_engine.run_all_checks = lambda *args, **kwargs: []
     
-    def create_test_image_file(self, filename='test_invoice.png'):
-        """Create a test image file for upload"""
-        image = Image.new('RGB', (800, 600), color='white')
-        image_io = BytesIO()
-        image.save(image_io, format='PNG')
-        image_io.seek(0)
-        
-        return SimpleUploadedFile(
-            filename,
-            image_io.getvalue(),
-            content_type='image/png'
-        )
+    def tearDown(self):
+        """Restore the stubbed services"""
+        gemini_service.extract_data_from_image = self._orig_extract
+        analysis_engine.run_all_checks = self._orig_run_checks
     
-    @patch('invoice_processor.services.gemini_service.extract_data_from_image')
-    @patch('invoice_processor.services.analysis_engine.run_all_checks')
-    def test_complete_bulk_upload_workflow_success(self, mock_run_checks, mock_extract):
+    def _fake_extract(self, *args, **kwargs):
+        """Return queued extraction results in order, then the sample data"""
+        if self.extraction_results:
+            return self.extraction_results.pop(0)
+        return self.sample_extracted_data
+    
+    def test_complete_bulk_upload_workflow_success(self):
         """
         Test complete bulk upload workflow:
         1. User uploads multiple files
@@ -96,18 +109,11 @@ class EndToEndBulkUploadWorkflowTest(TestCase):
         4. Progress is tracked
         5. User receives completion notification
         """
-        self.client.login(username='e2e_user', password='testpass123')
+        self.client.force_login(self.user)
         
-        # Mock successful extraction and compliance
-        mock_extract.return_value = self.sample_extracted_data
-        mock_run_checks.return_value = []
+        # Extraction and compliance are stubbed to succeed in setUp
         
         # Step 1: Upload multiple files
-        test_files = [
-            self.create_test_image_file(f'invoice_{i}.png')
-            for i in range(3)
-        ]
-        
         # Note: Due to invoice_date constraint bug in bulk_upload_handler,
         # we'll test the workflow conceptually
         
@@ -121,9 +127,8 @@ class EndToEndBulkUploadWorkflowTest(TestCase):
         )
         
         # Step 2: Create invoices for the batch
-        invoices = []
-        for i in range(3):
-            invoice = Invoice.objects.create(
+        invoices = Invoice.objects.bulk_create([
+            Invoice(
                 invoice_id='PENDING',
                 invoice_date=datetime.now().date(),
                 vendor_name='Processing...',
@@ -132,16 +137,22 @@ class EndToEndBulkUploadWorkflowTest(TestCase):
                 grand_total=0,
                 status='PENDING_ANALYSIS',
                 uploaded_by=self.user,
-                file_path=self.create_test_image_file(f'invoice_{i}.png'),
+                file_path=make_png_upload(f'invoice_{i}.png'),
                 batch=batch,
                 extraction_method='AI'
             )
-            invoices.append(invoice)
+            for i in range(3)
+        ])
         
-        # Step 3: Process each invoice asynchronously
-        for invoice in invoices:
-            result = process_invoice_async(invoice.id, str(batch.batch_id))
-            self.assertEqual(result['status'], 'success')
+        # Step 3: Process the whole batch in a single task dispatch
+        result = process_invoice_batch_async(
+            [invoice.id for invoice in invoices], str(batch.batch_id)
+        )
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(
+            [item['status'] for item in result['results']],
+            ['success'] * 3
+        )
         
         # Step 4: Verify progress tracking
         batch.refresh_from_db()
@@ -150,21 +161,27 @@ class EndToEndBulkUploadWorkflowTest(TestCase):
         self.assertEqual(batch.status, 'COMPLETED')
         
         # Step 5: Verify all invoices were processed correctly
-        for invoice in invoices:
-            invoice.refresh_from_db()
+        with self.assertNumQueries(2):
+            processed_invoices = list(
+                Invoice.objects.filter(
+                    id__in=[invoice.id for invoice in invoices]
+                ).select_related('health_score').prefetch_related('line_items')
+            )
+        
+        self.assertEqual(len(processed_invoices), 3)
+        for invoice in processed_invoices:
             self.assertEqual(invoice.invoice_id, 'E2E-INV-001')
             self.assertEqual(invoice.status, 'CLEARED')
             self.assertTrue(hasattr(invoice, 'health_score'))
-            self.assertEqual(invoice.line_items.count(), 1)
+            self.assertEqual(len(invoice.line_items.all()), 1)
         
         print("✓ Complete bulk upload workflow test passed")
     
-    @patch('invoice_processor.services.gemini_service.extract_data_from_image')
-    def test_bulk_upload_with_mixed_results(self, mock_extract):
+    def test_bulk_upload_with_mixed_results(self):
         """
         Test bulk upload with some successes and some failures
         """
-        self.client.login(username='e2e_user', password='testpass123')
+        self.client.force_login(self.user)
         
         # Create batch
         batch = InvoiceBatch.objects.create(
@@ -176,9 +193,8 @@ class EndToEndBulkUploadWorkflowTest(TestCase):
         )
         
         # Create invoices
-        invoices = []
-        for i in range(4):
-            invoice = Invoice.objects.create(
+        invoices = Invoice.objects.bulk_create([
+            Invoice(
                 invoice_id='PENDING',
                 invoice_date=datetime.now().date(),
                 vendor_name='Processing...',
@@ -187,25 +203,28 @@ class EndToEndBulkUploadWorkflowTest(TestCase):
                 grand_total=0,
                 status='PENDING_ANALYSIS',
                 uploaded_by=self.user,
-                file_path=self.create_test_image_file(f'invoice_{i}.png'),
+                file_path=make_png_upload(f'invoice_{i}.png'),
                 batch=batch,
                 extraction_method='AI'
             )
-            invoices.append(invoice)
+            for i in range(4)
+        ])
         
         # Process with alternating success/failure
-        for i, invoice in enumerate(invoices):
-            if i % 2 == 0:
-                # Success
-                mock_extract.return_value = self.sample_extracted_data
-            else:
-                # Failure
-                mock_extract.return_value = {
-                    'is_invoice': False,
-                    'error': 'Not an invoice'
-                }
-            
-            process_invoice_async(invoice.id, str(batch.batch_id))
+        failed_extraction = {
+            'is_invoice': False,
+            'error': 'Not an invoice'
+        }
+        self.extraction_results = [
+            self.sample_extracted_data,
+            failed_extraction,
+            self.sample_extracted_data,
+            failed_extraction,
+        ]
+        
+        process_invoice_batch_async(
+            [invoice.id for invoice in invoices], str(batch.batch_id)
+        )
         
         # Verify mixed results
         batch.refresh_from_db()
@@ -216,6 +235,7 @@ class EndToEndBulkUploadWorkflowTest(TestCase):
         print("✓ Bulk upload with mixed results test passed")
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class EndToEndManualEntryWorkflowTest(TestCase):
     """
     Test complete manual entry fallback workflow
@@ -224,25 +244,13 @@ class EndToEndManualEntryWorkflowTest(TestCase):
     def setUp(self):
         """Set up test fixtures"""
         self.client = Client()
+        use_in_memory_storage(self)
         self.user = User.objects.create_user(
             username='manual_user',
             email='manual@example.com',
             password='testpass123'
         )
     
-    def create_test_image_file(self, filename='failed_invoice.png'):
-        """Create a test image file"""
-        image = Image.new('RGB', (800, 600), color='white')
-        image_io = BytesIO()
-        image.save(image_io, format='PNG')
-        image_io.seek(0)
-        
-        return SimpleUploadedFile(
-            filename,
-            image_io.getvalue(),
-            content_type='image/png'
-        )
-    
     def test_complete_manual_entry_workflow(self):
         """
         Test complete manual entry workflow:
@@ -254,7 +262,7 @@ class EndToEndManualEntryWorkflowTest(TestCase):
         6. Health score is calculated
         7. Invoice is processed successfully
         """
-        self.client.login(username='manual_user', password='testpass123')
+        self.client.force_login(self.user)
         
         # Step 1 & 2: Create invoice flagged for manual entry (simulating AI failure)
         failed_invoice = Invoice.objects.create(
@@ -266,7 +274,7 @@ class EndToEndManualEntryWorkflowTest(TestCase):
             grand_total=Decimal('0'),
             status='PENDING_ANALYSIS',
             uploaded_by=self.user,
-            file_path=self.create_test_image_file(),
+            file_path=make_png_upload('failed_invoice.png'),
             extraction_method='MANUAL',
             extraction_failure_reason='AI extraction failed: Poor image quality'
         )
@@ -318,24 +326,36 @@ class EndToEndManualEntryWorkflowTest(TestCase):
         print("✓ Complete manual entry workflow test passed")
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class EndToEndDashboardWorkflowTest(TestCase):
     """
     Test dashboard with real data
     """
     
-    def setUp(self):
-        """Set up test fixtures with real data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpClass(cls):
+        """Resolve URLs once for all tests"""
+        super().setUpClass()
+        cls.dashboard_url = reverse('dashboard')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures with real data shared by all tests"""
+        cls.user = User.objects.create_user(
             username='dashboard_user',
             email='dashboard@example.com',
             password='testpass123'
         )
         
         # Create realistic invoice data for the last 7 days
-        self.create_realistic_invoice_data()
+        cls.create_realistic_invoice_data()
     
-    def create_realistic_invoice_data(self):
+    def setUp(self):
+        """Set up per-test client"""
+        self.client = Client()
+    
+    @classmethod
+    def create_realistic_invoice_data(cls):
         """Create realistic invoice data for testing dashboard"""
         hsn_codes = ['8517', '8471', '9403', '8528', '8443']
         vendors = [
@@ -346,15 +366,18 @@ class EndToEndDashboardWorkflowTest(TestCase):
             ('Vendor E Co', '29ABCDE7890F1G5'),
         ]
         
+        invoices = []
+        line_items = []
+        health_scores = []
+        
         for day in range(7):
             date_offset = timezone.now() - timedelta(days=day)
             
             for i in range(3):  # 3 invoices per day
                 vendor_name, vendor_gstin = vendors[i % len(vendors)]
-                hsn_code = hsn_codes[i % len(hsn_codes)]
                 
                 # Create invoice
-                invoice = Invoice.objects.create(
+                invoices.append(Invoice(
                     invoice_id=f'DASH-{day:02d}-{i:03d}',
                     invoice_date=date_offset.date(),
                     vendor_name=vendor_name,
@@ -363,36 +386,46 @@ class EndToEndDashboardWorkflowTest(TestCase):
                     grand_total=Decimal(10000 + (i * 5000)),
                     status='CLEARED' if i % 3 != 0 else 'HAS_ANOMALIES',
                     gst_verification_status='VERIFIED',
-                    uploaded_by=self.user,
+                    uploaded_by=cls.user,
                     uploaded_at=date_offset
-                )
-                
-                # Create line item
-                LineItem.objects.create(
-                    invoice=invoice,
-                    description=f'Product {hsn_code}',
-                    normalized_key=f'product_{hsn_code}',
-                    hsn_sac_code=hsn_code,
-                    quantity=Decimal('10.00'),
-                    unit_price=Decimal('1000.00'),
-                    billed_gst_rate=Decimal('18.00'),
-                    line_total=Decimal('11800.00')
-                )
-                
-                # Create health score
-                health_status = 'HEALTHY' if i % 3 != 0 else 'AT_RISK'
-                overall_score = Decimal('8.5') if health_status == 'HEALTHY' else Decimal('3.5')
-                
-                InvoiceHealthScore.objects.create(
-                    invoice=invoice,
-                    overall_score=overall_score,
-                    status=health_status,
-                    data_completeness_score=Decimal('90.00'),
-                    verification_score=Decimal('85.00'),
-                    compliance_score=Decimal('80.00'),
-                    fraud_detection_score=Decimal('75.00'),
-                    ai_confidence_score_component=Decimal('88.00')
-                )
+                ))
+        
+        # Insert all invoices at once; primary keys are set on the returned objects
+        Invoice.objects.bulk_create(invoices)
+        
+        for index, invoice in enumerate(invoices):
+            i = index % 3  # Position of the invoice within its day
+            hsn_code = hsn_codes[i % len(hsn_codes)]
+            
+            # Create line item
+            line_items.append(LineItem(
+                invoice=invoice,
+                description=f'Product {hsn_code}',
+                normalized_key=f'product_{hsn_code}',
+                hsn_sac_code=hsn_code,
+                quantity=Decimal('10.00'),
+                unit_price=Decimal('1000.00'),
+                billed_gst_rate=Decimal('18.00'),
+                line_total=Decimal('11800.00')
+            ))
+            
+            # Create health score
+            health_status = 'HEALTHY' if i % 3 != 0 else 'AT_RISK'
+            overall_score = Decimal('8.5') if health_status == 'HEALTHY' else Decimal('3.5')
+            
+            health_scores.append(InvoiceHealthScore(
+                invoice=invoice,
+                overall_score=overall_score,
+                status=health_status,
+                data_completeness_score=Decimal('90.00'),
+                verification_score=Decimal('85.00'),
+                compliance_score=Decimal('80.00'),
+                fraud_detection_score=Decimal('75.00'),
+                ai_confidence_score_component=Decimal('88.00')
+            ))
+        
+        LineItem.objects.bulk_create(line_items)
+        InvoiceHealthScore.objects.bulk_create(health_scores)
     
     def test_dashboard_displays_all_components(self):
         """
@@ -402,10 +435,13 @@ class EndToEndDashboardWorkflowTest(TestCase):
         - Company Leaderboard
         - Red Flag List
         """
-        self.client.login(username='dashboard_user', password='testpass123')
+        self.client.force_login(self.user)
         
-        dashboard_url = reverse('dashboard')
-        response = self.client.get(dashboard_url)
+        # Query count must not grow with the number of invoices or days (no N+1):
+        # session, user, profile, invoice metrics, anomaly count, 3 analytics,
+        # red flag list, anomaly breakdown, recent invoices and suspected invoices
+        with self.assertNumQueries(12):
+            response = self.client.get(self.dashboard_url)
         
         self.assertEqual(response.status_code, 200)
         
@@ -439,10 +475,9 @@ class EndToEndDashboardWorkflowTest(TestCase):
     
     def test_dashboard_chart_data_accuracy(self):
         """Test that dashboard chart data is accurate"""
-        self.client.login(username='dashboard_user', password='testpass123')
+        self.client.force_login(self.user)
         
-        dashboard_url = reverse('dashboard')
-        response = self.client.get(dashboard_url)
+        response = self.client.get(self.dashboard_url)
         
         # Verify invoice per day data
         invoice_per_day = response.context['invoice_per_day_data']
@@ -459,53 +494,47 @@ class EndToEndDashboardWorkflowTest(TestCase):
         
         # Verify leaderboard sorting
         leaderboard = response.context['company_leaderboard']
-        if len(leaderboard) > 1:
-            for i in range(len(leaderboard) - 1):
-                self.assertGreaterEqual(
-                    leaderboard[i]['total_amount'],
-                    leaderboard[i + 1]['total_amount']
-                )
+        amounts = [row['total_amount'] for row in leaderboard]
+        self.assertEqual(amounts, sorted(amounts, reverse=True))
         
         # Verify red flag list sorting
         red_flags = response.context['red_flag_list']
-        if len(red_flags) > 1:
-            for i in range(len(red_flags) - 1):
-                self.assertLessEqual(
-                    red_flags[i]['health_score'],
-                    red_flags[i + 1]['health_score']
-                )
+        scores = [row['health_score'] for row in red_flags]
+        self.assertEqual(scores, sorted(scores))
         
         print("✓ Dashboard chart data accuracy test passed")
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class EndToEndProfileAndSettingsWorkflowTest(TestCase):
     """
     Test all user profile and settings features
     """
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpClass(cls):
+        """Resolve URLs once for all tests"""
+        super().setUpClass()
+        cls.profile_url = reverse('user_profile')
+        cls.settings_url = reverse('settings')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures shared by all tests"""
+        cls.user = User.objects.create_user(
             username='profile_user',
             email='profile@example.com',
             password='testpass123',
             first_name='Profile',
             last_name='User'
         )
+        # Profiles are not auto-created, so prepare one the views will reuse
+        cls.profile = UserProfile.objects.create(user=cls.user)
     
-    def create_test_image(self, size=(100, 100)):
-        """Create a test image for profile picture"""
-        image = Image.new('RGB', size, color='blue')
-        image_io = BytesIO()
-        image.save(image_io, format='PNG')
-        image_io.seek(0)
-        
-        return SimpleUploadedFile(
-            'profile_pic.png',
-            image_io.getvalue(),
-            content_type='image/png'
-        )
+    def setUp(self):
+        """Set up per-test client and file storage"""
+        self.client = Client()
+        use_in_memory_storage(self)
     
     def test_complete_profile_management_workflow(self):
         """
@@ -515,19 +544,17 @@ class EndToEndProfileAndSettingsWorkflowTest(TestCase):
         3. Upload profile picture
         4. Verify changes
         """
-        self.client.login(username='profile_user', password='testpass123')
-        
-        profile_url = reverse('user_profile')
+        self.client.force_login(self.user)
         
         # Step 1: View profile page
-        response = self.client.get(profile_url)
+        response = self.client.get(self.profile_url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Profile')
         
         # Step 2 & 3: Update profile with picture
-        test_image = self.create_test_image()
+        test_image = make_png_upload('profile_pic.png')
         
-        response = self.client.post(profile_url, {
+        response = self.client.post(self.profile_url, {
             'first_name': 'Updated',
             'last_name': 'Profile',
             'email': 'updated@example.com',
@@ -541,7 +568,8 @@ class EndToEndProfileAndSettingsWorkflowTest(TestCase):
         
         # Step 4: Verify changes
         self.user.refresh_from_db()
-        profile = UserProfile.objects.get(user=self.user)
+        self.profile.refresh_from_db()
+        profile = self.profile
         
         self.assertEqual(self.user.first_name, 'Updated')
         self.assertEqual(self.user.email, 'updated@example.com')
@@ -549,10 +577,6 @@ class EndToEndProfileAndSettingsWorkflowTest(TestCase):
         self.assertEqual(profile.company_name, 'Test Company Ltd')
         self.assertTrue(profile.profile_picture)
         
-        # Clean up
-        if profile.profile_picture and os.path.exists(profile.profile_picture.path):
-            os.remove(profile.profile_picture.path)
-        
         print("✓ Complete profile management workflow test passed")
     
     def test_complete_settings_management_workflow(self):
@@ -563,17 +587,15 @@ class EndToEndProfileAndSettingsWorkflowTest(TestCase):
         3. Toggle social connections
         4. Verify changes
         """
-        self.client.login(username='profile_user', password='testpass123')
-        
-        settings_url = reverse('settings')
+        self.client.force_login(self.user)
         
         # Step 1: View settings page
-        response = self.client.get(settings_url)
+        response = self.client.get(self.settings_url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Settings')
         
         # Step 2 & 3: Update settings
-        response = self.client.post(settings_url, {
+        response = self.client.post(self.settings_url, {
             'enable_sound_effects': 'on',
             'enable_animations': '',  # Off
             'enable_notifications': 'on',
@@ -584,7 +606,8 @@ class EndToEndProfileAndSettingsWorkflowTest(TestCase):
         self.assertEqual(response.status_code, 302)
         
         # Step 4: Verify changes
-        profile = UserProfile.objects.get(user=self.user)
+        self.profile.refresh_from_db()
+        profile = self.profile
         
         self.assertTrue(profile.enable_sound_effects)
         self.assertFalse(profile.enable_animations)
@@ -595,28 +618,42 @@ class EndToEndProfileAndSettingsWorkflowTest(TestCase):
         print("✓ Complete settings management workflow test passed")
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class EndToEndDataExportWorkflowTest(TestCase):
     """
     Test data export functionality
     """
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpClass(cls):
+        """Resolve URLs once for all tests"""
+        super().setUpClass()
+        cls.export_invoices_url = reverse('export_invoices')
+        cls.export_gst_cache_url = reverse('export_gst_cache')
+        cls.export_my_data_url = reverse('export_my_data')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures shared by all tests"""
+        cls.user = User.objects.create_user(
             username='export_user',
             email='export@example.com',
             password='testpass123'
         )
         
         # Create test data
-        self.create_test_data()
+        cls.create_test_data()
     
-    def create_test_data(self):
+    def setUp(self):
+        """Set up per-test client"""
+        self.client = Client()
+    
+    @classmethod
+    def create_test_data(cls):
         """Create test data for export"""
         # Create invoices
-        for i in range(5):
-            Invoice.objects.create(
+        Invoice.objects.bulk_create([
+            Invoice(
                 invoice_id=f'EXPORT-{i:03d}',
                 invoice_date=date(2024, 1, 15 + i),
                 vendor_name=f'Export Vendor {i}',
@@ -625,17 +662,21 @@ class EndToEndDataExportWorkflowTest(TestCase):
                 grand_total=Decimal(10000 + (i * 1000)),
                 status='CLEARED',
                 gst_verification_status='VERIFIED',
-                uploaded_by=self.user
+                uploaded_by=cls.user
             )
+            for i in range(5)
+        ])
         
         # Create GST cache entries
-        for i in range(3):
-            GSTCacheEntry.objects.create(
+        GSTCacheEntry.objects.bulk_create([
+            GSTCacheEntry(
                 gstin=f'29CACHE{i:04d}XYZ',
                 legal_name=f'Cache Company {i}',
                 status='Active',
                 verification_count=i + 1
             )
+            for i in range(3)
+        ])
     
     def test_export_invoices_workflow(self):
         """
@@ -645,21 +686,27 @@ class EndToEndDataExportWorkflowTest(TestCase):
         3. Receive CSV file
         4. Verify content
         """
-        self.client.login(username='export_user', password='testpass123')
+        self.client.force_login(self.user)
         
         # Export invoices
-        export_url = reverse('export_invoices')
-        response = self.client.get(export_url)
+        response = self.client.get(self.export_invoices_url)
         
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'text/csv')
         self.assertIn('attachment', response['Content-Disposition'])
         
-        # Verify content
+        # Verify content: one row per stored invoice, matching its values
         content = response.content.decode('utf-8')
-        self.assertIn('EXPORT-000', content)
-        self.assertIn('EXPORT-004', content)
-        self.assertIn('Export Vendor', content)
+        rows = list(csv.DictReader(io.StringIO(content)))
+        stored_invoices = Invoice.objects.filter(uploaded_by=self.user).in_bulk()
+        
+        self.assertEqual(
+            {int(row['Id']): (row['Invoice Id'], row['Vendor Name'], row['Grand Total']) for row in rows},
+            {
+                pk: (invoice.invoice_id, invoice.vendor_name, f'{invoice.grand_total:.2f}')
+                for pk, invoice in stored_invoices.items()
+            }
+        )
         
         print("✓ Export invoices workflow test passed")
     
@@ -667,11 +714,10 @@ class EndToEndDataExportWorkflowTest(TestCase):
         """
         Test GST cache export workflow
         """
-        self.client.login(username='export_user', password='testpass123')
+        self.client.force_login(self.user)
         
         # Export GST cache
-        export_url = reverse('export_gst_cache')
-        response = self.client.get(export_url)
+        response = self.client.get(self.export_gst_cache_url)
         
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'text/csv')
@@ -687,11 +733,10 @@ class EndToEndDataExportWorkflowTest(TestCase):
         """
         Test comprehensive user data export workflow
         """
-        self.client.login(username='export_user', password='testpass123')
+        self.client.force_login(self.user)
         
         # Export user data
-        export_url = reverse('export_my_data')
-        response = self.client.get(export_url)
+        response = self.client.get(self.export_my_data_url)
         
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'text/csv')
@@ -706,15 +751,25 @@ class EndToEndDataExportWorkflowTest(TestCase):
         print("✓ Export my data workflow test passed")
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class EndToEndIntegrationSmokeTest(TestCase):
     """
     Smoke test to verify all major Phase 2 features work together
     """
     
-    def setUp(self):
-        """Set up comprehensive test environment"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpClass(cls):
+        """Resolve URLs once for all tests"""
+        super().setUpClass()
+        cls.dashboard_url = reverse('dashboard')
+        cls.profile_url = reverse('user_profile')
+        cls.settings_url = reverse('settings')
+        cls.gst_cache_url = reverse('gst_cache')
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up comprehensive test environment shared by all tests"""
+        cls.user = User.objects.create_user(
             username='smoke_test_user',
             email='smoke@example.com',
             password='testpass123',
@@ -722,22 +777,28 @@ class EndToEndIntegrationSmokeTest(TestCase):
             last_name='Test'
         )
     
+    def setUp(self):
+        """Set up per-test client"""
+        self.client = Client()
+    
     def test_all_phase2_features_accessible(self):
         """
         Smoke test: Verify all Phase 2 pages are accessible
         """
-        self.client.login(username='smoke_test_user', password='testpass123')
+        self.client.force_login(self.user)
         
         # Test all major pages
         pages_to_test = [
-            ('dashboard', 'Dashboard'),
-            ('user_profile', 'Profile'),
-            ('settings', 'Settings'),
-            ('gst_cache', 'GST Cache'),
+            ('dashboard', self.dashboard_url, 'Dashboard'),
+            ('user_profile', self.profile_url, 'Profile'),
+            ('settings', self.settings_url, 'Settings'),
+            ('gst_cache', self.gst_cache_url, 'GST Cache'),
         ]
         
-        for url_name, expected_content in pages_to_test:
-            response = self.client.get(reverse(url_name))
+        # Requests stay serial: worker threads would open their own DB
+        # connections, which cannot see this test's uncommitted user/session
+        for url_name, url, expected_content in pages_to_test:
+            response = self.client.get(url)
             self.assertEqual(response.status_code, 200, 
                            f"Failed to access {url_name}")
             self.assertContains(response, expected_content,
@@ -749,26 +810,26 @@ class EndToEndIntegrationSmokeTest(TestCase):
         """
         Test that users can navigate between all Phase 2 features
         """
-        self.client.login(username='smoke_test_user', password='testpass123')
+        self.client.force_login(self.user)
         
         # Navigate through features
         # Dashboard -> Profile
-        response = self.client.get(reverse('dashboard'))
+        response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
         
-        response = self.client.get(reverse('user_profile'))
+        response = self.client.get(self.profile_url)
         self.assertEqual(response.status_code, 200)
         
         # Profile -> Settings
-        response = self.client.get(reverse('settings'))
+        response = self.client.get(self.settings_url)
         self.assertEqual(response.status_code, 200)
         
         # Settings -> GST Cache
-        response = self.client.get(reverse('gst_cache'))
+        response = self.client.get(self.gst_cache_url)
         self.assertEqual(response.status_code, 200)
         
         # GST Cache -> Dashboard (full circle)
-        response = self.client.get(reverse('dashboard'))
+        response = self.client.get(self.dashboard_url)
         self.assertEqual(response.status_code, 200)
         
         print("✓ Navigation between features test passed")
@@ -10,28 +10,61 @@ This test module covers:
 Requirements tested: 2.3, 2.4
 """
 
+import logging
 from decimal import Decimal
 from datetime import datetime, date, timedelta
-from io import BytesIO
-from PIL import Image
+from unittest.mock import patch
 
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
+from django.db.models import Count, Q
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from invoice_processor.models import Invoice, LineItem, ComplianceFlag, InvoiceHealthScore
 from invoice_processor.services.manual_entry_service import manual_entry_service
 from invoice_processor.forms import ManualInvoiceEntryForm
+from invoice_processor.testing import FAST_PASSWORD_HASHERS, IN_MEMORY_STORAGES, MINIMAL_PNG
 
 
+# Valid submission with a single line item; tests override individual fields
+MANUAL_ENTRY_FORM_DATA = {
+    'invoice_id': 'INV-2024-001',
+    'invoice_date': '2024-01-15',
+    'vendor_name': 'Test Vendor Ltd',
+    'vendor_gstin': '27AAPFU0939F1ZV',
+    'billed_company_gstin': '29AABCT1332L1ZZ',
+    'grand_total': '1180.00',
+    'line_items[1][description]': 'Test Product A',
+    'line_items[1][hsn_sac_code]': '1001',
+    'line_items[1][quantity]': '10',
+    'line_items[1][unit_price]': '100.00',
+    'line_items[1][billed_gst_rate]': '18.00',
+    'line_items[1][line_total]': '1180.00',
+}
+
+
+@override_settings(
+    PASSWORD_HASHERS=FAST_PASSWORD_HASHERS,
+    # Uploaded fixture images are never read back; keep them off MEDIA_ROOT
+    STORAGES=IN_MEMORY_STORAGES,
+)
 class ManualEntryIntegrationTests(TestCase):
     """Integration tests for manual invoice entry functionality"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpClass(cls):
+        """Silence logging for all tests"""
+        # The views log every submission and error path; none of it is asserted
+        logging.disable(logging.CRITICAL)
+        # Re-enable logging for other test modules, even if class setup fails
+        cls.addClassCleanup(logging.disable, logging.NOTSET)
+        super().setUpClass()
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures shared by all tests"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
@@ -39,7 +72,7 @@ class ManualEntryIntegrationTests(TestCase):
         
         # Create a test invoice flagged for manual entry
         # Use a placeholder date since invoice_date is required by the model
-        self.manual_invoice = Invoice.objects.create(
+        cls.manual_invoice = Invoice.objects.create(
             invoice_id='',
             invoice_date=date.today(),  # Placeholder date
             vendor_name='',
@@ -47,25 +80,82 @@ class ManualEntryIntegrationTests(TestCase):
             billed_company_gstin='',
             grand_total=Decimal('0'),
             status='PENDING_ANALYSIS',
-            uploaded_by=self.user,
-            file_path=self.create_test_image_file(),
+            uploaded_by=cls.user,
+            file_path=cls.create_test_image_file(),
             extraction_method='MANUAL',
             extraction_failure_reason='AI extraction failed: Not an invoice'
         )
+        
+        # Invoices only some tests need, inserted together
+        cls.other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        cls.other_user_invoice, cls.normal_invoice, cls.duplicate_invoice = Invoice.objects.bulk_create([
+            Invoice(
+                invoice_id='',
+                invoice_date=date.today(),  # Placeholder date
+                vendor_name='',
+                vendor_gstin='',
+                billed_company_gstin='',
+                grand_total=Decimal('0'),
+                status='PENDING_ANALYSIS',
+                uploaded_by=cls.other_user,
+                file_path=cls.create_test_image_file(),
+                extraction_method='MANUAL',
+                extraction_failure_reason='AI extraction failed'
+            ),
+            # Not flagged for manual entry
+            Invoice(
+                invoice_id='INV-001',
+                invoice_date=date(2024, 1, 15),
+                vendor_name='Test Vendor',
+                vendor_gstin='27AAPFU0939F1ZV',
+                billed_company_gstin='29AABCT1332L1ZZ',
+                grand_total=Decimal('1000.00'),
+                status='CLEARED',
+                uploaded_by=cls.user,
+                file_path=cls.create_test_image_file(),
+                extraction_method='AI'
+            ),
+            # Same invoice ID and vendor as the duplicate detection submission
+            Invoice(
+                invoice_id='INV-DUPLICATE',
+                invoice_date=date(2024, 1, 1),
+                vendor_name='Test Vendor Ltd',
+                vendor_gstin='27AAPFU0939F1ZV',
+                billed_company_gstin='29AABCT1332L1ZZ',
+                grand_total=Decimal('1000.00'),
+                status='CLEARED',
+                uploaded_by=cls.user,
+                file_path=cls.create_test_image_file()
+            ),
+        ])
+        
+        # Resolve the fixed per-invoice URLs once
+        cls.manual_entry_url = reverse('manual_entry', args=[cls.manual_invoice.id])
+        cls.submit_url = reverse('submit_manual_entry', args=[cls.manual_invoice.id])
     
-    def create_test_image_file(self, filename='test_invoice.png'):
+    def setUp(self):
+        """Set up per-test client"""
+        self.client = Client()
+    
+    @classmethod
+    def create_test_image_file(cls, filename='test_invoice.png'):
         """Create a test image file"""
-        image = Image.new('RGB', (800, 600), color='white')
-        image_io = BytesIO()
-        image.save(image_io, format='PNG')
-        image_io.seek(0)
-        
         return SimpleUploadedFile(
             filename,
-            image_io.getvalue(),
+            MINIMAL_PNG,
             content_type='image/png'
         )
     
+    def _form_data(self, **overrides):
+        """Return a copy of the valid submission data with overrides applied"""
+        form_data = dict(MANUAL_ENTRY_FORM_DATA)
+        form_data.update(overrides)
+        return form_data
+    
     # Test 1: Form Validation
     
     def test_manual_entry_form_valid_data(self):
@@ -203,7 +293,7 @@ class ManualEntryIntegrationTests(TestCase):
     
     def test_manual_entry_page_requires_authentication(self):
         """Test that manual entry page requires authentication"""
-        url = reverse('manual_entry', args=[self.manual_invoice.id])
+        url = self.manual_entry_url
         response = self.client.get(url)
         
         # Should redirect to login
@@ -212,9 +302,9 @@ class ManualEntryIntegrationTests(TestCase):
     
     def test_manual_entry_page_access_own_invoice(self):
         """Test accessing manual entry page for own invoice"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('manual_entry', args=[self.manual_invoice.id])
+        url = self.manual_entry_url
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, 200)
@@ -223,79 +313,31 @@ class ManualEntryIntegrationTests(TestCase):
     
     def test_manual_entry_page_cannot_access_other_user_invoice(self):
         """Test cannot access another user's invoice"""
-        # Create another user and their invoice
-        other_user = User.objects.create_user(
-            username='otheruser',
-            email='other@example.com',
-            password='testpass123'
-        )
-        
-        other_invoice = Invoice.objects.create(
-            invoice_id='',
-            invoice_date=date.today(),  # Placeholder date
-            vendor_name='',
-            vendor_gstin='',
-            billed_company_gstin='',
-            grand_total=Decimal('0'),
-            status='PENDING_ANALYSIS',
-            uploaded_by=other_user,
-            file_path=self.create_test_image_file(),
-            extraction_method='MANUAL',
-            extraction_failure_reason='AI extraction failed'
-        )
-        
-        # Try to access as testuser
-        self.client.login(username='testuser', password='testpass123')
-        url = reverse('manual_entry', args=[other_invoice.id])
+        # Try to access another user's invoice as testuser
+        self.client.force_login(self.user)
+        url = reverse('manual_entry', args=[self.other_user_invoice.id])
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, 404)
     
     def test_manual_entry_page_redirect_if_not_manual(self):
         """Test redirect if invoice doesn't require manual entry"""
-        # Create a normal invoice (not flagged for manual entry)
-        normal_invoice = Invoice.objects.create(
-            invoice_id='INV-001',
-            invoice_date=date(2024, 1, 15),
-            vendor_name='Test Vendor',
-            vendor_gstin='27AAPFU0939F1ZV',
-            billed_company_gstin='29AABCT1332L1ZZ',
-            grand_total=Decimal('1000.00'),
-            status='CLEARED',
-            uploaded_by=self.user,
-            file_path=self.create_test_image_file(),
-            extraction_method='AI'
-        )
-        
-        self.client.login(username='testuser', password='testpass123')
-        url = reverse('manual_entry', args=[normal_invoice.id])
+        self.client.force_login(self.user)
+        url = reverse('manual_entry', args=[self.normal_invoice.id])
         response = self.client.get(url)
         
         # Should redirect to invoice detail
         self.assertEqual(response.status_code, 302)
     
-    def test_manual_entry_submission_success(self):
+    @patch('invoice_processor.views.run_all_checks', return_value=[])
+    def test_manual_entry_submission_success(self, mock_run_all_checks):
         """Test successful manual entry submission"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
         # Prepare form data
-        form_data = {
-            'invoice_id': 'INV-2024-001',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
-            'vendor_gstin': '27AAPFU0939F1ZV',
-            'billed_company_gstin': '29AABCT1332L1ZZ',
-            'grand_total': '1180.00',
-            # Line items
-            'line_items[1][description]': 'Test Product A',
-            'line_items[1][hsn_sac_code]': '1001',
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
-        }
+        form_data = self._form_data()
         
         response = self.client.post(url, form_data)
         
@@ -310,29 +352,23 @@ class ManualEntryIntegrationTests(TestCase):
         self.assertEqual(self.manual_invoice.grand_total, Decimal('1180.00'))
         
         # Verify line items were created
-        self.assertEqual(self.manual_invoice.line_items.count(), 1)
-        line_item = self.manual_invoice.line_items.first()
-        self.assertEqual(line_item.description, 'Test Product A')
-        self.assertEqual(line_item.quantity, Decimal('10'))
+        line_items = list(self.manual_invoice.line_items.all())
+        self.assertEqual(len(line_items), 1)
+        self.assertEqual(line_items[0].description, 'Test Product A')
+        self.assertEqual(line_items[0].quantity, Decimal('10'))
     
-    def test_manual_entry_submission_with_multiple_line_items(self):
+    @patch('invoice_processor.views.run_all_checks', return_value=[])
+    def test_manual_entry_submission_with_multiple_line_items(self, mock_run_all_checks):
         """Test manual entry with multiple line items"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
-        form_data = {
+        form_data = self._form_data(**{
             'invoice_id': 'INV-2024-002',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
             'grand_total': '2360.00',
             # Line item 1
             'line_items[1][description]': 'Product A',
-            'line_items[1][hsn_sac_code]': '1001',
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
             # Line item 2
             'line_items[2][description]': 'Product B',
             'line_items[2][hsn_sac_code]': '1002',
@@ -340,21 +376,23 @@ class ManualEntryIntegrationTests(TestCase):
             'line_items[2][unit_price]': '200.00',
             'line_items[2][billed_gst_rate]': '18.00',
             'line_items[2][line_total]': '1180.00',
-        }
+        })
         
         response = self.client.post(url, form_data)
         
         self.assertEqual(response.status_code, 302)
         
         # Verify both line items were created
-        self.manual_invoice.refresh_from_db()
-        self.assertEqual(self.manual_invoice.line_items.count(), 2)
+        self.assertQuerySetEqual(
+            self.manual_invoice.line_items.order_by('description').values_list('description', flat=True),
+            ['Product A', 'Product B']
+        )
     
     def test_manual_entry_submission_invalid_data(self):
         """Test manual entry submission with invalid data"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
         # Missing required field (invoice_id)
         form_data = {
@@ -373,23 +411,13 @@ class ManualEntryIntegrationTests(TestCase):
     
     def test_manual_entry_compliance_checks_executed(self):
         """Test that compliance checks run on manually entered data"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
-        form_data = {
-            'invoice_id': 'INV-2024-001',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
-            'vendor_gstin': '27AAPFU0939F1ZV',
-            'grand_total': '1180.00',
-            'line_items[1][description]': 'Test Product A',
+        form_data = self._form_data(**{
             'line_items[1][hsn_sac_code]': '9999',  # Unknown HSN
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
-        }
+        })
         
         response = self.client.post(url, form_data)
         
@@ -397,73 +425,41 @@ class ManualEntryIntegrationTests(TestCase):
         
         # Verify compliance flags were created
         self.manual_invoice.refresh_from_db()
-        flags = ComplianceFlag.objects.filter(invoice=self.manual_invoice)
-        self.assertGreater(flags.count(), 0)
+        flags = list(ComplianceFlag.objects.filter(invoice=self.manual_invoice))
+        self.assertGreater(len(flags), 0)
     
     def test_manual_entry_duplicate_detection(self):
         """Test duplicate detection for manually entered invoice"""
-        # Create an existing invoice with same ID and vendor
-        existing_invoice = Invoice.objects.create(
-            invoice_id='INV-DUPLICATE',
-            invoice_date=date(2024, 1, 1),
-            vendor_name='Test Vendor Ltd',
-            vendor_gstin='27AAPFU0939F1ZV',
-            billed_company_gstin='29AABCT1332L1ZZ',
-            grand_total=Decimal('1000.00'),
-            status='CLEARED',
-            uploaded_by=self.user,
-            file_path=self.create_test_image_file()
-        )
+        # self.duplicate_invoice already exists with the same ID and vendor
+        self.client.force_login(self.user)
         
-        self.client.login(username='testuser', password='testpass123')
-        
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
         # Submit with same invoice ID and vendor
-        form_data = {
+        form_data = self._form_data(**{
             'invoice_id': 'INV-DUPLICATE',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
-            'vendor_gstin': '27AAPFU0939F1ZV',
-            'grand_total': '1180.00',
             'line_items[1][description]': 'Test Product',
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
-        }
+        })
         
         response = self.client.post(url, form_data)
         
         self.assertEqual(response.status_code, 302)
         
-        # Verify duplicate flag was created
-        self.manual_invoice.refresh_from_db()
-        duplicate_flags = ComplianceFlag.objects.filter(
-            invoice=self.manual_invoice,
-            flag_type='DUPLICATE'
-        )
-        self.assertGreater(duplicate_flags.count(), 0)
-        self.assertEqual(self.manual_invoice.status, 'HAS_ANOMALIES')
+        # Verify duplicate flag was created and status updated, in one query
+        row = Invoice.objects.filter(pk=self.manual_invoice.pk).annotate(
+            duplicate_count=Count('compliance_flags', filter=Q(compliance_flags__flag_type='DUPLICATE'))
+        ).values('status', 'duplicate_count').get()
+        self.assertGreater(row['duplicate_count'], 0)
+        self.assertEqual(row['status'], 'HAS_ANOMALIES')
     
     def test_manual_entry_arithmetic_error_detection(self):
         """Test arithmetic error detection in manual entry"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
         # Line total doesn't match calculation
-        form_data = {
-            'invoice_id': 'INV-2024-001',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
-            'grand_total': '1000.00',  # Incorrect total
-            'line_items[1][description]': 'Test Product',
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
-        }
+        form_data = self._form_data(grand_total='1000.00')  # Incorrect total
         
         response = self.client.post(url, form_data)
         
@@ -473,58 +469,33 @@ class ManualEntryIntegrationTests(TestCase):
     
     def test_manual_entry_health_score_calculation(self):
         """Test health score is calculated for manually entered invoice"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
-        form_data = {
-            'invoice_id': 'INV-2024-001',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
-            'vendor_gstin': '27AAPFU0939F1ZV',
-            'billed_company_gstin': '29AABCT1332L1ZZ',
-            'grand_total': '1180.00',
-            'line_items[1][description]': 'Test Product A',
-            'line_items[1][hsn_sac_code]': '1001',
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
-        }
+        form_data = self._form_data()
         
         response = self.client.post(url, form_data)
         
         self.assertEqual(response.status_code, 302)
         
         # Verify health score was created
-        self.manual_invoice.refresh_from_db()
-        self.assertTrue(hasattr(self.manual_invoice, 'health_score'))
+        invoice = Invoice.objects.select_related('health_score').get(pk=self.manual_invoice.pk)
+        self.assertTrue(hasattr(invoice, 'health_score'))
         
-        health_score = InvoiceHealthScore.objects.get(invoice=self.manual_invoice)
+        health_score = invoice.health_score
         self.assertIsNotNone(health_score.overall_score)
         self.assertIn(health_score.status, ['HEALTHY', 'REVIEW', 'AT_RISK'])
     
-    def test_manual_entry_status_cleared_no_critical_flags(self):
+    @patch('invoice_processor.views.run_all_checks', return_value=[])
+    def test_manual_entry_status_cleared_no_critical_flags(self, mock_run_all_checks):
         """Test invoice status is CLEARED when no critical flags"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
         # Valid data with no issues
-        form_data = {
-            'invoice_id': 'INV-2024-CLEAN',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
-            'vendor_gstin': '27AAPFU0939F1ZV',
-            'billed_company_gstin': '29AABCT1332L1ZZ',
-            'grand_total': '1180.00',
-            'line_items[1][description]': 'Test Product A',
-            'line_items[1][hsn_sac_code]': '1001',
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
-        }
+        form_data = self._form_data(invoice_id='INV-2024-CLEAN')
         
         response = self.client.post(url, form_data)
         
@@ -532,27 +503,18 @@ class ManualEntryIntegrationTests(TestCase):
         
         # Verify status
         self.manual_invoice.refresh_from_db()
-        # Status could be CLEARED or HAS_ANOMALIES depending on compliance checks
-        # Just verify it's not PENDING_ANALYSIS anymore
-        self.assertIn(self.manual_invoice.status, ['CLEARED', 'HAS_ANOMALIES'])
+        self.assertEqual(self.manual_invoice.status, 'CLEARED')
     
-    def test_manual_entry_preserves_extraction_method(self):
+    @patch('invoice_processor.views.run_all_checks', return_value=[])
+    def test_manual_entry_preserves_extraction_method(self, mock_run_all_checks):
         """Test that extraction_method remains MANUAL after submission"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
+        url = self.submit_url
         
-        form_data = {
-            'invoice_id': 'INV-2024-001',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
-            'grand_total': '1180.00',
+        form_data = self._form_data(**{
             'line_items[1][description]': 'Test Product',
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
-        }
+        })
         
         response = self.client.post(url, form_data)
         
@@ -564,36 +526,40 @@ class ManualEntryIntegrationTests(TestCase):
     
     def test_manual_entry_resubmission_replaces_line_items(self):
         """Test that resubmitting manual entry replaces existing line items"""
-        # First submission
-        self.client.login(username='testuser', password='testpass123')
-        
-        url = reverse('submit_manual_entry', args=[self.manual_invoice.id])
-        
-        form_data = {
-            'invoice_id': 'INV-2024-001',
-            'invoice_date': '2024-01-15',
-            'vendor_name': 'Test Vendor Ltd',
-            'grand_total': '1180.00',
-            'line_items[1][description]': 'Original Product',
-            'line_items[1][quantity]': '10',
-            'line_items[1][unit_price]': '100.00',
-            'line_items[1][billed_gst_rate]': '18.00',
-            'line_items[1][line_total]': '1180.00',
-        }
+        # State left behind by a first submission, written directly
+        LineItem.objects.create(
+            invoice=self.manual_invoice,
+            description='Original Product',
+            normalized_key='original product',
+            hsn_sac_code='1001',
+            quantity=Decimal('10'),
+            unit_price=Decimal('100.00'),
+            billed_gst_rate=Decimal('18.00'),
+            line_total=Decimal('1180.00')
+        )
+        InvoiceHealthScore.objects.create(
+            invoice=self.manual_invoice,
+            overall_score=Decimal('8.0'),
+            status='HEALTHY',
+            data_completeness_score=Decimal('100.00'),
+            verification_score=Decimal('100.00'),
+            compliance_score=Decimal('100.00'),
+            fraud_detection_score=Decimal('100.00'),
+            ai_confidence_score_component=Decimal('100.00')
+        )
         
-        self.client.post(url, form_data)
+        # Resubmission with different data
+        self.client.force_login(self.user)
         
-        # Verify first submission
-        self.manual_invoice.refresh_from_db()
-        self.assertEqual(self.manual_invoice.line_items.count(), 1)
-        self.assertEqual(self.manual_invoice.line_items.first().description, 'Original Product')
+        url = self.submit_url
         
-        # Second submission with different data
-        form_data['line_items[1][description]'] = 'Updated Product'
+        form_data = self._form_data(**{
+            'line_items[1][description]': 'Updated Product',
+        })
         
         self.client.post(url, form_data)
         
         # Verify line items were replaced
-        self.manual_invoice.refresh_from_db()
-        self.assertEqual(self.manual_invoice.line_items.count(), 1)
-        self.assertEqual(self.manual_invoice.line_items.first().description, 'Updated Product')
+        line_items = list(self.manual_invoice.line_items.all())
+        self.assertEqual(len(line_items), 1)
+        self.assertEqual(line_items[0].description, 'Updated Product')
@@ -5,43 +5,88 @@ Tests profile viewing, updates, profile picture upload, and validation.
 Requirements: 9.1, 9.2, 9.3, 9.4, 9.5
 """
 
-from django.test import TestCase, Client
+import os
+
+from django.test import TestCase, Client, override_settings, tag
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
 from django.core.files.uploadedfile import SimpleUploadedFile
 from PIL import Image
 from io import BytesIO
-import os
 
+from invoice_processor.forms import UserProfileForm
 from invoice_processor.models import UserProfile
 from invoice_processor.services.user_profile_service import user_profile_service
+from invoice_processor.testing import FAST_PASSWORD_HASHERS, use_in_memory_storage
+
 
+# Profile form data matching the test user; tests override individual fields
+PROFILE_FORM_DATA = {
+    'first_name': 'Test',
+    'last_name': 'User',
+    'email': 'test@example.com',
+    'username': 'testuser',
+    'phone_number': '',
+    'company_name': '',
+}
 
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class ProfileManagementIntegrationTests(TestCase):
     """Integration tests for profile management functionality"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    # Plain TestCase isolation (class transaction + per-test savepoints) is
+    # enough here; never serialize the database between tests
+    serialized_rollback = False
+    
+    @classmethod
+    def setUpClass(cls):
+        """Encode the test images once for all tests"""
+        super().setUpClass()
+        cls._image_bytes = {
+            ((100, 100), 'PNG'): cls.encode_test_image(),
+            ((100, 100), 'JPEG'): cls.encode_test_image(format='JPEG'),
+            ((200, 200), 'PNG'): cls.encode_test_image(size=(200, 200)),
+        }
+        # Valid 1x1 PNG padded past IEND: image decoders ignore the trailing
+        # zeros, but the upload size check counts them
+        cls._large_png_bytes = cls.encode_test_image(size=(1, 1)) + bytes(1024 * 1024)
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures shared by all tests"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123',
             first_name='Test',
             last_name='User'
         )
-        self.profile_url = reverse('user_profile')
+        cls.profile_url = reverse('user_profile')
     
-    def create_test_image(self, size=(100, 100), format='PNG'):
-        """Helper method to create a test image file"""
+    def setUp(self):
+        """Set up per-test client and file storage"""
+        self.client = Client()
+        use_in_memory_storage(self)
+    
+    @staticmethod
+    def encode_test_image(size=(100, 100), format='PNG', **save_kwargs):
+        """Helper method to encode a solid test image"""
         image = Image.new('RGB', size, color='red')
         image_io = BytesIO()
-        image.save(image_io, format=format)
-        image_io.seek(0)
-        image_io.name = f'test_image.{format.lower()}'
+        image.save(image_io, format=format, **save_kwargs)
+        return image_io.getvalue()
+    
+    def _post_profile(self, **overrides):
+        """POST the current profile data with the given fields overridden"""
+        return self.client.post(self.profile_url, {**PROFILE_FORM_DATA, **overrides})
+    
+    def create_test_image(self, size=(100, 100), format='PNG'):
+        """Helper method to create a test image file from the cached bytes"""
         return SimpleUploadedFile(
-            image_io.name,
-            image_io.read(),
+            f'test_image.{format.lower()}',
+            self._image_bytes[(size, format)],
             content_type=f'image/{format.lower()}'
         )
     
@@ -57,7 +102,7 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_profile_page_displays_for_authenticated_user(self):
         """Test that authenticated user can view profile page"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         response = self.client.get(self.profile_url)
         
@@ -67,7 +112,7 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_profile_page_displays_current_user_data(self):
         """Test that profile page displays current user information"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Create profile with data
         profile = user_profile_service.get_or_create_profile(self.user)
@@ -75,7 +120,9 @@ class ProfileManagementIntegrationTests(TestCase):
         profile.company_name = 'Test Company'
         profile.save()
         
-        response = self.client.get(self.profile_url)
+        # Session, user and profile; templates reuse the cached profile
+        with self.assertNumQueries(3):
+            response = self.client.get(self.profile_url)
         
         form = response.context['form']
         self.assertEqual(form.initial['first_name'], 'Test')
@@ -87,7 +134,7 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_profile_auto_created_on_first_access(self):
         """Test that UserProfile is automatically created on first access"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Ensure no profile exists
         UserProfile.objects.filter(user=self.user).delete()
@@ -102,20 +149,16 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_update_basic_user_info(self):
         """Test updating user's basic information (name, email)"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Updated',
-            'last_name': 'Name',
-            'email': 'updated@example.com',
-            'username': 'testuser',  # Username is readonly but included in form
-            'phone_number': '',
-            'company_name': ''
-        })
+        response = self._post_profile(
+            first_name='Updated',
+            last_name='Name',
+            email='updated@example.com'
+        )
         
         # Should redirect back to profile page
-        self.assertEqual(response.status_code, 302)
-        self.assertEqual(response.url, self.profile_url)
+        self.assertRedirects(response, self.profile_url, fetch_redirect_response=False)
         
         # Verify user data was updated
         self.user.refresh_from_db()
@@ -125,42 +168,40 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_update_profile_fields(self):
         """Test updating profile-specific fields (phone, company)"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+        profile = UserProfile.objects.create(user=self.user)
         
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '+9876543210',
-            'company_name': 'New Company Ltd'
-        })
+        # Session, user, profile, email uniqueness check and one UPDATE per table
+        with self.assertNumQueries(6):
+            response = self._post_profile(
+                phone_number='+9876543210',
+                company_name='New Company Ltd'
+            )
         
-        self.assertEqual(response.status_code, 302)
+        self.assertRedirects(response, self.profile_url, fetch_redirect_response=False)
         
         # Verify profile data was updated
-        profile = UserProfile.objects.get(user=self.user)
+        profile.refresh_from_db()
         self.assertEqual(profile.phone_number, '+9876543210')
         self.assertEqual(profile.company_name, 'New Company Ltd')
     
     def test_update_all_fields_together(self):
         """Test updating both user and profile fields in one request"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Complete',
-            'last_name': 'Update',
-            'email': 'complete@example.com',
-            'username': 'testuser',
-            'phone_number': '+1111111111',
-            'company_name': 'Complete Company'
-        })
+        self.client.force_login(self.user)
+        
+        response = self._post_profile(
+            first_name='Complete',
+            last_name='Update',
+            email='complete@example.com',
+            phone_number='+1111111111',
+            company_name='Complete Company'
+        )
         
-        self.assertEqual(response.status_code, 302)
+        self.assertRedirects(response, self.profile_url, fetch_redirect_response=False)
         
         # Verify all updates
         self.user.refresh_from_db()
-        profile = UserProfile.objects.get(user=self.user)
+        profile = self.user.profile
         
         self.assertEqual(self.user.first_name, 'Complete')
         self.assertEqual(self.user.last_name, 'Update')
@@ -170,200 +211,114 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_update_with_success_message(self):
         """Test that successful update shows success message"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': ''
-        }, follow=True)
+        response = self._post_profile()
         
         # Check for success message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertEqual(len(messages), 1)
         self.assertIn('Profile updated successfully', str(messages[0]))
     
     # Test Profile Picture Upload (Requirements 9.3, 9.4)
     
     def test_upload_valid_profile_picture(self):
-        """Test uploading a valid profile picture"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        test_image = self.create_test_image()
-        
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': '',
-            'profile_picture': test_image
-        })
-        
-        self.assertEqual(response.status_code, 302)
-        
-        # Verify profile picture was saved
-        profile = UserProfile.objects.get(user=self.user)
-        self.assertTrue(profile.profile_picture)
-        self.assertTrue(os.path.exists(profile.profile_picture.path))
-        
-        # Clean up
-        if profile.profile_picture:
-            os.remove(profile.profile_picture.path)
-    
-    def test_upload_profile_picture_jpeg(self):
-        """Test uploading JPEG profile picture"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        test_image = self.create_test_image(format='JPEG')
-        
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': '',
-            'profile_picture': test_image
-        })
-        
-        self.assertEqual(response.status_code, 302)
-        
-        profile = UserProfile.objects.get(user=self.user)
-        self.assertTrue(profile.profile_picture)
-        
-        # Clean up
-        if profile.profile_picture:
-            os.remove(profile.profile_picture.path)
+        """Test uploading valid PNG and JPEG profile pictures"""
+        self.client.force_login(self.user)
+        
+        for format in ('PNG', 'JPEG'):
+            with self.subTest(format=format):
+                test_image = self.create_test_image(format=format)
+                
+                response = self._post_profile(profile_picture=test_image)
+                
+                self.assertRedirects(response, self.profile_url, fetch_redirect_response=False)
+                
+                # Verify profile picture was saved (query fresh: each upload replaces the last)
+                profile = UserProfile.objects.get(user=self.user)
+                self.assertTrue(profile.profile_picture)
+                self.assertTrue(profile.profile_picture.storage.exists(profile.profile_picture.name))
     
     def test_upload_replaces_old_profile_picture(self):
         """Test that uploading new picture replaces old one"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Upload first picture
         first_image = self.create_test_image()
-        self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': '',
-            'profile_picture': first_image
-        })
-        
-        profile = UserProfile.objects.get(user=self.user)
-        first_picture_name = profile.profile_picture.name
+        self._post_profile(profile_picture=first_image)
+        
+        profile = self.user.profile
+        storage = profile.profile_picture.storage
+        picture_dir = os.path.dirname(profile.profile_picture.name)
         
         # Upload second picture
         second_image = self.create_test_image(size=(200, 200))
-        self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': '',
-            'profile_picture': second_image
-        })
+        self._post_profile(profile_picture=second_image)
         
         profile.refresh_from_db()
-        second_picture_name = profile.profile_picture.name
         
-        # Profile picture should be updated (different file)
-        self.assertNotEqual(first_picture_name, second_picture_name)
-        # New file should exist
-        self.assertTrue(os.path.exists(profile.profile_picture.path))
-        
-        # Clean up
-        if profile.profile_picture:
-            os.remove(profile.profile_picture.path)
+        # Only the new picture should be left in storage
+        _, stored_files = storage.listdir(picture_dir)
+        self.assertEqual(stored_files, [os.path.basename(profile.profile_picture.name)])
+        with profile.profile_picture.open('rb') as picture:
+            self.assertEqual(Image.open(picture).size, (200, 200))
     
     def test_profile_update_without_picture_preserves_existing(self):
         """Test that updating profile without picture preserves existing picture"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Upload picture first
         test_image = self.create_test_image()
-        self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': '',
-            'profile_picture': test_image
-        })
-        
-        profile = UserProfile.objects.get(user=self.user)
-        picture_path = profile.profile_picture.path
+        self._post_profile(profile_picture=test_image)
+        
+        profile = self.user.profile
+        picture_name = profile.profile_picture.name
         
         # Update profile without picture
-        self.client.post(self.profile_url, {
-            'first_name': 'Updated',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '+1234567890',
-            'company_name': 'Test Company'
-        })
+        self._post_profile(
+            first_name='Updated',
+            phone_number='+1234567890',
+            company_name='Test Company'
+        )
         
         profile.refresh_from_db()
         
         # Picture should still exist
         self.assertTrue(profile.profile_picture)
-        self.assertEqual(profile.profile_picture.path, picture_path)
-        self.assertTrue(os.path.exists(picture_path))
+        self.assertEqual(profile.profile_picture.name, picture_name)
+        self.assertTrue(profile.profile_picture.storage.exists(picture_name))
         
         # Other fields should be updated
         self.user.refresh_from_db()
         self.assertEqual(self.user.first_name, 'Updated')
         self.assertEqual(profile.phone_number, '+1234567890')
-        
-        # Clean up
-        if profile.profile_picture:
-            os.remove(profile.profile_picture.path)
     
     # Test Validation (Requirement 9.5)
     
+    # Field-level validation is decided by UserProfileForm alone, so these
+    # tests bind the form directly; the view's handling of an invalid form is
+    # covered by test_validation_error_message_displayed
+    
     def test_validation_required_fields(self):
         """Test validation for required fields"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        response = self.client.post(self.profile_url, {
-            'first_name': '',  # Required
-            'last_name': '',   # Required
-            'email': '',       # Required
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': ''
-        })
-        
-        # Should not redirect (form has errors)
-        self.assertEqual(response.status_code, 200)
-        self.assertFormError(response, 'form', 'first_name', 'This field is required.')
-        self.assertFormError(response, 'form', 'last_name', 'This field is required.')
-        self.assertFormError(response, 'form', 'email', 'This field is required.')
+        form = UserProfileForm(data=dict(
+            PROFILE_FORM_DATA,
+            first_name='',  # Required
+            last_name='',  # Required
+            email=''  # Required
+        ))
+        
+        self.assertFalse(form.is_valid())
+        self.assertFormError(form, 'first_name', 'This field is required.')
+        self.assertFormError(form, 'last_name', 'This field is required.')
+        self.assertFormError(form, 'email', 'This field is required.')
     
     def test_validation_invalid_email(self):
         """Test validation for invalid email format"""
-        self.client.login(username='testuser', password='testpass123')
+        form = UserProfileForm(data=dict(PROFILE_FORM_DATA, email='invalid-email'))  # Invalid format
         
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'invalid-email',  # Invalid format
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': ''
-        })
-        
-        self.assertEqual(response.status_code, 200)
-        self.assertFormError(response, 'form', 'email', 'Enter a valid email address.')
+        self.assertFalse(form.is_valid())
+        self.assertFormError(form, 'email', 'Enter a valid email address.')
     
     def test_validation_duplicate_email(self):
         """Test validation prevents duplicate email addresses"""
@@ -374,20 +329,13 @@ class ProfileManagementIntegrationTests(TestCase):
             password='testpass123'
         )
         
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Try to use other user's email
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'other@example.com',  # Already taken
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': ''
-        }, follow=True)
+        response = self._post_profile(email='other@example.com')  # Already taken
         
         # Should show error message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('already in use' in str(msg) for msg in messages))
         
         # Email should not be changed
@@ -396,43 +344,27 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_validation_profile_picture_too_large(self):
         """Test validation rejects profile pictures over 1MB"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        # Create a file that's actually over 1MB in file size
-        # We need to create a large enough image that even compressed is over 1MB
-        large_image = Image.new('RGB', (5000, 5000), color='red')
-        image_io = BytesIO()
-        # Save with minimal compression to ensure large file size
-        large_image.save(image_io, format='PNG', compress_level=0)
-        image_io.seek(0)
+        self.client.force_login(self.user)
         
-        # Verify it's actually over 1MB
-        file_size = len(image_io.getvalue())
+        # Verify the cached image is actually over 1MB
+        file_size = len(self._large_png_bytes)
         self.assertGreater(file_size, 1024 * 1024, "Test image should be over 1MB")
         
         large_file = SimpleUploadedFile(
             'large_image.png',
-            image_io.read(),
+            self._large_png_bytes,
             content_type='image/png'
         )
         
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': '',
-            'profile_picture': large_file
-        }, follow=True)
+        response = self._post_profile(profile_picture=large_file)
         
         # Should show error message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('1MB limit' in str(msg) or 'exceeds' in str(msg) for msg in messages))
     
     def test_validation_profile_picture_invalid_format(self):
         """Test validation rejects invalid image formats"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Create invalid file (text file pretending to be image)
         invalid_file = SimpleUploadedFile(
@@ -441,15 +373,7 @@ class ProfileManagementIntegrationTests(TestCase):
             content_type='text/plain'
         )
         
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': '',
-            'profile_picture': invalid_file
-        })
+        response = self._post_profile(profile_picture=invalid_file)
         
         # Should have form errors
         self.assertEqual(response.status_code, 200)
@@ -458,26 +382,15 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_validation_phone_number_format(self):
         """Test validation for phone number format"""
-        self.client.login(username='testuser', password='testpass123')
-        
         # Invalid phone number with letters
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'testuser',
-            'phone_number': 'abc123xyz',  # Invalid
-            'company_name': ''
-        })
+        form = UserProfileForm(data=dict(PROFILE_FORM_DATA, phone_number='abc123xyz'))  # Invalid
         
-        self.assertEqual(response.status_code, 200)
-        self.assertFormError(response, 'form', 'phone_number', 
-                           'Phone number should contain only digits and optional + prefix')
+        self.assertFalse(form.is_valid())
+        self.assertFormError(form, 'phone_number',
+                             'Phone number should contain only digits and optional + prefix')
     
     def test_validation_phone_number_accepts_valid_formats(self):
         """Test that valid phone number formats are accepted"""
-        self.client.login(username='testuser', password='testpass123')
-        
         valid_numbers = [
             '+1234567890',
             '1234567890',
@@ -485,32 +398,21 @@ class ProfileManagementIntegrationTests(TestCase):
             '(123) 456-7890'
         ]
         
+        # The full POST path is covered by test_update_profile_fields
         for phone_number in valid_numbers:
-            response = self.client.post(self.profile_url, {
-                'first_name': 'Test',
-                'last_name': 'User',
-                'email': 'test@example.com',
-                'username': 'testuser',
-                'phone_number': phone_number,
-                'company_name': ''
-            })
+            form = UserProfileForm(data=dict(PROFILE_FORM_DATA, phone_number=phone_number))
             
-            # Should succeed (redirect)
-            self.assertEqual(response.status_code, 302, 
-                           f"Failed for phone number: {phone_number}")
+            self.assertTrue(form.is_valid(),
+                            f"Failed for phone number: {phone_number}")
     
     def test_validation_error_message_displayed(self):
         """Test that validation errors are displayed to user"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        response = self.client.post(self.profile_url, {
-            'first_name': '',  # Invalid
-            'last_name': 'User',
-            'email': 'invalid-email',  # Invalid
-            'username': 'testuser',
-            'phone_number': '',
-            'company_name': ''
-        })
+        response = self._post_profile(
+            first_name='',  # Invalid
+            email='invalid-email'  # Invalid
+        )
         
         self.assertEqual(response.status_code, 200)
         
@@ -522,21 +424,20 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_profile_update_with_whitespace_trimming(self):
         """Test that whitespace is trimmed from input fields"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        response = self.client.post(self.profile_url, {
-            'first_name': '  Trimmed  ',
-            'last_name': '  Name  ',
-            'email': '  trimmed@example.com  ',
-            'username': 'testuser',
-            'phone_number': '  +1234567890  ',
-            'company_name': '  Trimmed Company  '
-        })
+        self.client.force_login(self.user)
+        
+        response = self._post_profile(
+            first_name='  Trimmed  ',
+            last_name='  Name  ',
+            email='  trimmed@example.com  ',
+            phone_number='  +1234567890  ',
+            company_name='  Trimmed Company  '
+        )
         
-        self.assertEqual(response.status_code, 302)
+        self.assertRedirects(response, self.profile_url, fetch_redirect_response=False)
         
         self.user.refresh_from_db()
-        profile = UserProfile.objects.get(user=self.user)
+        profile = self.user.profile
         
         # Whitespace should be trimmed
         self.assertEqual(self.user.first_name, 'Trimmed')
@@ -545,50 +446,42 @@ class ProfileManagementIntegrationTests(TestCase):
     
     def test_profile_update_preserves_username(self):
         """Test that username cannot be changed through profile update"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        response = self.client.post(self.profile_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com',
-            'username': 'differentusername',  # Attempt to change
-            'phone_number': '',
-            'company_name': ''
-        })
+        response = self._post_profile(username='differentusername')  # Attempt to change
         
-        self.assertEqual(response.status_code, 302)
+        self.assertRedirects(response, self.profile_url, fetch_redirect_response=False)
         
         # Username should remain unchanged
         self.user.refresh_from_db()
         self.assertEqual(self.user.username, 'testuser')
     
+    @tag('slow')
     def test_concurrent_profile_updates(self):
         """Test that concurrent updates don't cause data loss"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # First update
-        self.client.post(self.profile_url, {
-            'first_name': 'First',
-            'last_name': 'Update',
-            'email': 'first@example.com',
-            'username': 'testuser',
-            'phone_number': '+1111111111',
-            'company_name': 'First Company'
-        })
+        self._post_profile(
+            first_name='First',
+            last_name='Update',
+            email='first@example.com',
+            phone_number='+1111111111',
+            company_name='First Company'
+        )
         
         # Second update (simulating concurrent request)
-        self.client.post(self.profile_url, {
-            'first_name': 'Second',
-            'last_name': 'Update',
-            'email': 'second@example.com',
-            'username': 'testuser',
-            'phone_number': '+2222222222',
-            'company_name': 'Second Company'
-        })
+        self._post_profile(
+            first_name='Second',
+            last_name='Update',
+            email='second@example.com',
+            phone_number='+2222222222',
+            company_name='Second Company'
+        )
         
         # Last update should win
         self.user.refresh_from_db()
-        profile = UserProfile.objects.get(user=self.user)
+        profile = self.user.profile
         
         self.assertEqual(self.user.first_name, 'Second')
         self.assertEqual(self.user.email, 'second@example.com')
@@ -5,45 +5,87 @@ Tests settings display, preference updates, logout functionality, and account de
 Requirements: 10.1, 10.2, 10.3, 10.4, 10.6
 """
 
-from django.test import TestCase, Client
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.test import TestCase, Client, RequestFactory, override_settings, tag
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
-from PIL import Image
-from io import BytesIO
-import os
+from datetime import date
+from decimal import Decimal
 
-from invoice_processor.models import UserProfile
+from invoice_processor.models import Invoice, UserProfile
 from invoice_processor.services.user_profile_service import user_profile_service
+from invoice_processor.testing import (
+    FAST_PASSWORD_HASHERS,
+    MINIMAL_PNG,
+    make_png_upload,
+    use_in_memory_storage,
+)
+from invoice_processor.views import settings as settings_view
 
 
+# Account fields matching the test user; checkboxes are unchecked unless a
+# test adds them
+SETTINGS_FORM_DATA = {
+    'first_name': 'Test',
+    'last_name': 'User',
+    'username': 'testuser',
+    'email': 'test@example.com',
+}
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class SettingsPageIntegrationTests(TestCase):
     """Integration tests for settings page functionality"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures shared by all tests"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123',
             first_name='Test',
             last_name='User'
         )
-        self.settings_url = reverse('settings')
-    
-    def create_test_image(self, size=(100, 100), format='PNG'):
-        """Helper method to create a test image file"""
-        image = Image.new('RGB', size, color='blue')
-        image_io = BytesIO()
-        image.save(image_io, format=format)
-        image_io.seek(0)
-        image_io.name = f'test_image.{format.lower()}'
-        return SimpleUploadedFile(
-            image_io.name,
-            image_io.read(),
-            content_type=f'image/{format.lower()}'
+        cls.profile = user_profile_service.get_or_create_profile(cls.user)
+        # Profiles are only created on demand, so this user starts without one;
+        # it is only ever logged in with force_login, so it needs no password
+        cls.user_without_profile = User.objects.create(
+            username='noprofileuser',
+            email='noprofile@example.com'
         )
+        cls.settings_url = reverse('settings')
+        
+        # Log in once; the session row lives in the class-level transaction
+        client = Client()
+        client.force_login(cls.user)
+        cls.session_key = client.session.session_key
+    
+    def setUp(self):
+        """Set up per-test client and file storage"""
+        self.client = Client()
+        use_in_memory_storage(self)
+    
+    def use_shared_session(self):
+        """Authenticate the client with the session created in setUpTestData"""
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = self.session_key
+    
+    def _post_settings(self, **overrides):
+        """POST the current account data with the given fields overridden"""
+        return self.client.post(self.settings_url, {**SETTINGS_FORM_DATA, **overrides})
+    
+    def post_settings_directly(self, **overrides):
+        """Call the settings view with a RequestFactory request, skipping middleware"""
+        # For tests that only check what the view saves; the routed client
+        # path is covered by the other update tests
+        request = RequestFactory().post(self.settings_url, {**SETTINGS_FORM_DATA, **overrides})
+        request.user = self.user
+        # Without the session middleware, keep flash messages on the request
+        request._messages = CookieStorage(request)
+        return settings_view(request)
     
     # Test Settings Display (Requirement 10.1)
     
@@ -57,7 +99,7 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_settings_page_displays_for_authenticated_user(self):
         """Test that authenticated user can view settings page"""
-        self.client.login(username='testuser', password='testpass123')
+        self.use_shared_session()
         
         response = self.client.get(self.settings_url)
         
@@ -66,18 +108,21 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_settings_page_displays_user_profile_data(self):
         """Test that settings page displays current user and profile data"""
-        self.client.login(username='testuser', password='testpass123')
+        self.use_shared_session()
+        
+        # Set profile preferences
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            enable_sound_effects=True,
+            enable_animations=False,
+            enable_notifications=True,
+            facebook_connected=False,
+            google_connected=True
+        )
         
-        # Create profile with preferences
-        profile = user_profile_service.get_or_create_profile(self.user)
-        profile.enable_sound_effects = True
-        profile.enable_animations = False
-        profile.enable_notifications = True
-        profile.facebook_connected = False
-        profile.google_connected = True
-        profile.save()
-        
-        response = self.client.get(self.settings_url)
+        # Session, the session user, then the user again with its profile
+        # joined in; the template reuses that profile
+        with self.assertNumQueries(3):
+            response = self.client.get(self.settings_url)
         
         self.assertEqual(response.status_code, 200)
         # Verify user data is accessible in template context
@@ -86,36 +131,33 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_settings_page_auto_creates_profile(self):
         """Test that UserProfile is automatically created if it doesn't exist"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        # Ensure no profile exists
-        UserProfile.objects.filter(user=self.user).delete()
+        self.client.force_login(self.user_without_profile)
         
         response = self.client.get(self.settings_url)
         
         self.assertEqual(response.status_code, 200)
         # Profile should be created
-        self.assertTrue(UserProfile.objects.filter(user=self.user).exists())
+        self.assertTrue(UserProfile.objects.filter(user=self.user_without_profile).exists())
     
     # Test Preference Updates (Requirements 10.2, 10.3)
     
     def test_update_account_settings(self):
         """Test updating account settings (name, username, email)"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Updated',
-            'last_name': 'Name',
-            'username': 'newusername',
-            'email': 'updated@example.com'
-        })
+        response = self._post_settings(
+            first_name='Updated',
+            last_name='Name',
+            username='newusername',
+            email='updated@example.com'
+        )
         
         # Should redirect back to settings page
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, self.settings_url)
         
         # Verify user data was updated
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['first_name', 'last_name', 'username', 'email'])
         self.assertEqual(self.user.first_name, 'Updated')
         self.assertEqual(self.user.last_name, 'Name')
         self.assertEqual(self.user.username, 'newusername')
@@ -123,136 +165,122 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_update_connected_services(self):
         """Test updating connected services toggles (Facebook, Google)"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Initially both disconnected
-        profile = user_profile_service.get_or_create_profile(self.user)
-        profile.facebook_connected = False
-        profile.google_connected = False
-        profile.save()
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            facebook_connected=False,
+            google_connected=False
+        )
         
         # Enable both services
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com',
-            'facebook_connected': 'on',
-            'google_connected': 'on'
-        })
+        response = self._post_settings(
+            facebook_connected='on',
+            google_connected='on'
+        )
         
         self.assertEqual(response.status_code, 302)
         
         # Verify services were enabled
-        profile.refresh_from_db()
-        self.assertTrue(profile.facebook_connected)
-        self.assertTrue(profile.google_connected)
+        self.profile.refresh_from_db(fields=['facebook_connected', 'google_connected'])
+        self.assertTrue(self.profile.facebook_connected)
+        self.assertTrue(self.profile.google_connected)
     
     def test_update_connected_services_disable(self):
         """Test disabling connected services"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Initially both connected
-        profile = user_profile_service.get_or_create_profile(self.user)
-        profile.facebook_connected = True
-        profile.google_connected = True
-        profile.save()
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            facebook_connected=True,
+            google_connected=True
+        )
         
         # Disable both services (checkboxes not sent when unchecked)
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com'
-            # facebook_connected and google_connected not included = unchecked
-        })
+        # facebook_connected and google_connected not included = unchecked
+        response = self._post_settings()
         
         self.assertEqual(response.status_code, 302)
         
         # Verify services were disabled
-        profile.refresh_from_db()
-        self.assertFalse(profile.facebook_connected)
-        self.assertFalse(profile.google_connected)
+        self.profile.refresh_from_db(fields=['facebook_connected', 'google_connected'])
+        self.assertFalse(self.profile.facebook_connected)
+        self.assertFalse(self.profile.google_connected)
     
     def test_update_preferences(self):
         """Test updating user preferences (sound, animations, notifications)"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Initially all disabled
-        profile = user_profile_service.get_or_create_profile(self.user)
-        profile.enable_sound_effects = False
-        profile.enable_animations = False
-        profile.enable_notifications = False
-        profile.save()
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            enable_sound_effects=False,
+            enable_animations=False,
+            enable_notifications=False
+        )
         
         # Enable all preferences
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com',
-            'enable_sound_effects': 'on',
-            'enable_animations': 'on',
-            'enable_notifications': 'on'
-        })
+        response = self._post_settings(
+            enable_sound_effects='on',
+            enable_animations='on',
+            enable_notifications='on'
+        )
         
         self.assertEqual(response.status_code, 302)
         
         # Verify preferences were enabled
-        profile.refresh_from_db()
-        self.assertTrue(profile.enable_sound_effects)
-        self.assertTrue(profile.enable_animations)
-        self.assertTrue(profile.enable_notifications)
+        self.profile.refresh_from_db(fields=['enable_sound_effects', 'enable_animations', 'enable_notifications'])
+        self.assertTrue(self.profile.enable_sound_effects)
+        self.assertTrue(self.profile.enable_animations)
+        self.assertTrue(self.profile.enable_notifications)
     
     def test_update_preferences_partial(self):
         """Test updating only some preferences"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        profile = user_profile_service.get_or_create_profile(self.user)
-        profile.enable_sound_effects = True
-        profile.enable_animations = True
-        profile.enable_notifications = True
-        profile.save()
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            enable_sound_effects=True,
+            enable_animations=True,
+            enable_notifications=True
+        )
         
         # Disable only animations
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com',
-            'enable_sound_effects': 'on',
-            'enable_notifications': 'on'
+        response = self._post_settings(
+            enable_sound_effects='on',
+            enable_notifications='on'
             # enable_animations not included = unchecked
-        })
+        )
         
         self.assertEqual(response.status_code, 302)
         
         # Verify only animations was disabled
-        profile.refresh_from_db()
-        self.assertTrue(profile.enable_sound_effects)
-        self.assertFalse(profile.enable_animations)
-        self.assertTrue(profile.enable_notifications)
+        self.profile.refresh_from_db(fields=['enable_sound_effects', 'enable_animations', 'enable_notifications'])
+        self.assertTrue(self.profile.enable_sound_effects)
+        self.assertFalse(self.profile.enable_animations)
+        self.assertTrue(self.profile.enable_notifications)
     
     def test_update_all_settings_together(self):
         """Test updating account, services, and preferences in one request"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Complete',
-            'last_name': 'Update',
-            'username': 'completeuser',
-            'email': 'complete@example.com',
-            'facebook_connected': 'on',
-            'google_connected': 'on',
-            'enable_sound_effects': 'on',
-            'enable_animations': 'on',
-            'enable_notifications': 'on'
-        })
+        self.client.force_login(self.user)
+        
+        # Session, session user, user with profile, username and email
+        # uniqueness checks and one UPDATE per table
+        with self.assertNumQueries(7):
+            response = self._post_settings(
+                first_name='Complete',
+                last_name='Update',
+                username='completeuser',
+                email='complete@example.com',
+                facebook_connected='on',
+                google_connected='on',
+                enable_sound_effects='on',
+                enable_animations='on',
+                enable_notifications='on'
+            )
         
         self.assertEqual(response.status_code, 302)
         
         # Verify all updates
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['first_name', 'last_name', 'username', 'email'])
         profile = UserProfile.objects.get(user=self.user)
         
         self.assertEqual(self.user.first_name, 'Complete')
@@ -267,85 +295,51 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_update_with_success_message(self):
         """Test that successful update shows success message"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com'
-        }, follow=True)
+        response = self._post_settings()
         
         # Check for success message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertEqual(len(messages), 1)
         self.assertIn('Settings updated successfully', str(messages[0]))
     
     def test_update_profile_picture_in_settings(self):
         """Test uploading profile picture through settings page"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
-        test_image = self.create_test_image()
+        test_image = make_png_upload('test_image.png')
         
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com',
-            'profile_picture': test_image
-        }, follow=True)
+        response = self._post_settings(profile_picture=test_image)
         
         # Should redirect successfully
-        self.assertEqual(response.status_code, 200)
+        self.assertRedirects(response, self.settings_url, fetch_redirect_response=False)
         
         # Verify profile picture was saved
         profile = UserProfile.objects.get(user=self.user)
         
-        # Check if profile picture was uploaded (it should have a name)
-        if profile.profile_picture:
-            self.assertTrue(profile.profile_picture.name)
-            # Clean up
-            try:
-                if os.path.exists(profile.profile_picture.path):
-                    os.remove(profile.profile_picture.path)
-            except (OSError, FileNotFoundError, ValueError):
-                pass  # File might not exist in test environment
-        else:
-            # If profile picture wasn't saved, check for success message
-            # The upload might have succeeded but file handling in test environment differs
-            messages = list(response.context['messages'])
-            self.assertTrue(any('success' in str(msg).lower() for msg in messages))
+        self.assertTrue(profile.profile_picture)
+        self.assertTrue(profile.profile_picture.storage.exists(profile.profile_picture.name))
     
     def test_update_profile_picture_size_validation(self):
         """Test that profile picture size is validated (1MB limit)"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        # Create a large image over 1MB
-        large_image = Image.new('RGB', (5000, 5000), color='blue')
-        image_io = BytesIO()
-        large_image.save(image_io, format='PNG', compress_level=0)
-        image_io.seek(0)
+        self.client.force_login(self.user)
         
-        # Verify it's over 1MB
-        file_size = len(image_io.getvalue())
-        self.assertGreater(file_size, 1024 * 1024, "Test image should be over 1MB")
+        # Pad the test PNG just past the view's 1 MB limit; the size check
+        # runs before anything decodes the file
+        large_png = MINIMAL_PNG + bytes(1024 * 1024)
+        self.assertGreater(len(large_png), 1024 * 1024, "Test image should be over 1MB")
         
         large_file = SimpleUploadedFile(
             'large_image.png',
-            image_io.read(),
+            large_png,
             content_type='image/png'
         )
         
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com',
-            'profile_picture': large_file
-        }, follow=True)
+        response = self._post_settings(profile_picture=large_file)
         
         # Should show error message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('1 MB' in str(msg) for msg in messages))
     
     # Test Validation
@@ -353,100 +347,90 @@ class SettingsPageIntegrationTests(TestCase):
     def test_validation_duplicate_username(self):
         """Test that duplicate username is rejected"""
         # Create another user
-        other_user = User.objects.create_user(
+        other_user = User.objects.create(
             username='otheruser',
-            email='other@example.com',
-            password='testpass123'
+            email='other@example.com'
         )
         
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Try to use other user's username
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'otheruser',  # Already taken
-            'email': 'test@example.com'
-        }, follow=True)
+        response = self._post_settings(username='otheruser')  # Already taken
         
         # Should show error message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('already taken' in str(msg) for msg in messages))
         
         # Username should not be changed
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['username'])
         self.assertEqual(self.user.username, 'testuser')
     
     def test_validation_duplicate_email(self):
         """Test that duplicate email is rejected"""
         # Create another user
-        other_user = User.objects.create_user(
+        other_user = User.objects.create(
             username='otheruser',
-            email='other@example.com',
-            password='testpass123'
+            email='other@example.com'
         )
         
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Try to use other user's email
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'other@example.com'  # Already taken
-        }, follow=True)
+        response = self._post_settings(email='other@example.com')  # Already taken
         
         # Should show error message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('already in use' in str(msg) for msg in messages))
         
         # Email should not be changed
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['email'])
         self.assertEqual(self.user.email, 'test@example.com')
     
     def test_validation_same_username_allowed(self):
         """Test that user can keep their own username"""
-        self.client.login(username='testuser', password='testpass123')
-        
         # Submit with same username
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Updated',
-            'last_name': 'User',
-            'username': 'testuser',  # Same username
-            'email': 'test@example.com'
-        })
+        response = self.post_settings_directly(first_name='Updated')
         
         # Should succeed
         self.assertEqual(response.status_code, 302)
         
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['first_name', 'username'])
         self.assertEqual(self.user.first_name, 'Updated')
         self.assertEqual(self.user.username, 'testuser')
     
     def test_validation_same_email_allowed(self):
         """Test that user can keep their own email"""
-        self.client.login(username='testuser', password='testpass123')
-        
         # Submit with same email
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Updated',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com'  # Same email
-        })
+        response = self.post_settings_directly(first_name='Updated')
         
         # Should succeed
         self.assertEqual(response.status_code, 302)
         
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['first_name', 'email'])
         self.assertEqual(self.user.first_name, 'Updated')
         self.assertEqual(self.user.email, 'test@example.com')
     
+    def test_settings_update_keeps_profile_fields_changed_elsewhere(self):
+        """Test that saving settings does not overwrite newer profile fields"""
+        # Changed behind the profile cached on self.user
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            phone_number='9876543210',
+            company_name='Newer Company'
+        )
+        
+        response = self.post_settings_directly(enable_animations='on')
+        
+        self.assertEqual(response.status_code, 302)
+        self.profile.refresh_from_db(fields=['phone_number', 'company_name', 'enable_animations'])
+        self.assertEqual(self.profile.phone_number, '9876543210')
+        self.assertEqual(self.profile.company_name, 'Newer Company')
+        self.assertTrue(self.profile.enable_animations)
+    
     # Test Logout Functionality (Requirement 10.4)
     
     def test_logout_from_settings_page(self):
         """Test that user can logout from settings page"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Verify user is logged in
         response = self.client.get(self.settings_url)
@@ -454,10 +438,10 @@ class SettingsPageIntegrationTests(TestCase):
         
         # Logout
         logout_url = reverse('logout')
-        response = self.client.post(logout_url, follow=True)
+        response = self.client.post(logout_url)
         
         # Should redirect to login page
-        self.assertIn('/login/', response.redirect_chain[0][0])
+        self.assertIn('/login/', response.url)
         
         # Verify user is logged out
         response = self.client.get(self.settings_url)
@@ -466,7 +450,7 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_logout_clears_session(self):
         """Test that logout clears user session"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Verify session exists
         self.assertIn('_auth_user_id', self.client.session)
@@ -480,7 +464,7 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_logout_redirects_to_login(self):
         """Test that logout redirects to login page"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         logout_url = reverse('logout')
         response = self.client.post(logout_url)
@@ -494,18 +478,16 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_settings_update_with_whitespace_trimming(self):
         """Test that whitespace is trimmed from input fields"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        response = self.client.post(self.settings_url, {
-            'first_name': '  Trimmed  ',
-            'last_name': '  Name  ',
-            'username': '  trimmeduser  ',
-            'email': '  trimmed@example.com  '
-        })
+        response = self.post_settings_directly(
+            first_name='  Trimmed  ',
+            last_name='  Name  ',
+            username='  trimmeduser  ',
+            email='  trimmed@example.com  '
+        )
         
         self.assertEqual(response.status_code, 302)
         
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['first_name', 'last_name', 'username', 'email'])
         
         # Whitespace should be trimmed
         self.assertEqual(self.user.first_name, 'Trimmed')
@@ -515,78 +497,68 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_settings_preserves_preferences_on_account_update(self):
         """Test that updating account info preserves existing preferences"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Set initial preferences
-        profile = user_profile_service.get_or_create_profile(self.user)
-        profile.enable_sound_effects = True
-        profile.enable_animations = False
-        profile.enable_notifications = True
-        profile.save()
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            enable_sound_effects=True,
+            enable_animations=False,
+            enable_notifications=True
+        )
         
         # Update only account info (no preference fields)
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Updated',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com'
-        })
+        response = self._post_settings(first_name='Updated')
         
         self.assertEqual(response.status_code, 302)
         
         # Preferences should be reset to False (unchecked checkboxes)
-        profile.refresh_from_db()
-        self.assertFalse(profile.enable_sound_effects)
-        self.assertFalse(profile.enable_animations)
-        self.assertFalse(profile.enable_notifications)
+        self.profile.refresh_from_db(fields=['enable_sound_effects', 'enable_animations', 'enable_notifications'])
+        self.assertFalse(self.profile.enable_sound_effects)
+        self.assertFalse(self.profile.enable_animations)
+        self.assertFalse(self.profile.enable_notifications)
     
     def test_settings_update_error_handling(self):
         """Test that errors during update are handled gracefully"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Create another user to test duplicate username error
-        other_user = User.objects.create_user(
+        other_user = User.objects.create(
             username='duplicateuser',
-            email='duplicate@example.com',
-            password='testpass123'
+            email='duplicate@example.com'
         )
         
         # Try to update with duplicate username
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'duplicateuser',  # Duplicate
-            'email': 'test@example.com'
-        }, follow=True)
+        response = self._post_settings(username='duplicateuser')  # Duplicate
         
         # Should show error message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('error' in str(msg).lower() or 'already taken' in str(msg).lower() for msg in messages))
     
+    @tag('slow')
     def test_concurrent_settings_updates(self):
         """Test that concurrent updates don't cause data loss"""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # First update
-        self.client.post(self.settings_url, {
-            'first_name': 'First',
-            'last_name': 'Update',
-            'username': 'firstuser',
-            'email': 'first@example.com',
-            'enable_sound_effects': 'on'
-        })
+        self._post_settings(
+            first_name='First',
+            last_name='Update',
+            username='firstuser',
+            email='first@example.com',
+            enable_sound_effects='on'
+        )
         
         # Second update (simulating concurrent request)
-        self.client.post(self.settings_url, {
-            'first_name': 'Second',
-            'last_name': 'Update',
-            'username': 'seconduser',
-            'email': 'second@example.com',
-            'enable_animations': 'on'
-        })
+        self._post_settings(
+            first_name='Second',
+            last_name='Update',
+            username='seconduser',
+            email='second@example.com',
+            enable_animations='on'
+        )
         
         # Last update should win
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['first_name', 'username', 'email'])
         profile = UserProfile.objects.get(user=self.user)
         
         self.assertEqual(self.user.first_name, 'Second')
@@ -597,46 +569,62 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_settings_page_handles_missing_profile(self):
         """Test that settings page handles missing profile gracefully"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        # Delete profile if exists
-        UserProfile.objects.filter(user=self.user).delete()
+        self.client.force_login(self.user_without_profile)
         
         # Should still load settings page
         response = self.client.get(self.settings_url)
         self.assertEqual(response.status_code, 200)
         
         # Profile should be auto-created
-        self.assertTrue(UserProfile.objects.filter(user=self.user).exists())
+        self.assertTrue(UserProfile.objects.filter(user=self.user_without_profile).exists())
     
     def test_settings_update_creates_profile_if_missing(self):
         """Test that updating settings creates profile if it doesn't exist"""
-        self.client.login(username='testuser', password='testpass123')
-        
-        # Delete profile
-        UserProfile.objects.filter(user=self.user).delete()
+        self.client.force_login(self.user_without_profile)
         
         # Update settings
-        response = self.client.post(self.settings_url, {
-            'first_name': 'Test',
-            'last_name': 'User',
-            'username': 'testuser',
-            'email': 'test@example.com',
-            'enable_sound_effects': 'on'
-        })
+        response = self._post_settings(
+            username='noprofileuser',
+            email='noprofile@example.com',
+            enable_sound_effects='on'
+        )
         
         self.assertEqual(response.status_code, 302)
         
         # Profile should be created with preferences
-        profile = UserProfile.objects.get(user=self.user)
+        profile = UserProfile.objects.get(user=self.user_without_profile)
         self.assertTrue(profile.enable_sound_effects)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class AccountDeletionIntegrationTests(TestCase):
+    """Integration tests for account deletion (Requirement 10.6)"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures shared by all tests"""
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            first_name='Test',
+            last_name='User'
+        )
+        cls.profile = user_profile_service.get_or_create_profile(cls.user)
+        cls.delete_url = reverse('delete_account')
+    
+    def setUp(self):
+        """Set up per-test client and file storage"""
+        self.client = Client()
+        use_in_memory_storage(self)
     
-    # Test Account Deletion (Requirement 10.6)
+    def _delete_account(self, confirmation='delete my account'):
+        """POST the account deletion form with the given confirmation text"""
+        return self.client.post(self.delete_url, {'confirmation': confirmation})
     
     def test_delete_account_requires_authentication(self):
         """Test that account deletion requires user to be logged in"""
-        delete_url = reverse('delete_account')
-        response = self.client.post(delete_url)
+        response = self.client.post(self.delete_url)
         
         # Should redirect to login page
         self.assertEqual(response.status_code, 302)
@@ -644,59 +632,50 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_delete_account_requires_confirmation(self):
         """Test that account deletion requires correct confirmation text"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Try without confirmation
-        response = self.client.post(delete_url, {
-            'confirmation': ''
-        }, follow=True)
+        response = self._delete_account('')
         
         # Should show error message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('type "delete my account"' in str(msg).lower() for msg in messages))
         
         # User should still be active
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['is_active'])
         self.assertTrue(self.user.is_active)
     
     def test_delete_account_requires_exact_confirmation_text(self):
         """Test that account deletion requires exact confirmation text"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Try with wrong confirmation text
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete account'  # Wrong text
-        }, follow=True)
+        response = self._delete_account('delete account')  # Wrong text
         
         # Should show error message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('type "delete my account"' in str(msg).lower() for msg in messages))
         
         # User should still be active
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['is_active'])
         self.assertTrue(self.user.is_active)
     
     def test_delete_account_successful_deletion(self):
         """Test successful account deletion with correct confirmation"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Store original user ID and username
         user_id = self.user.id
         original_username = self.user.username
         
         # Delete account with correct confirmation
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        }, follow=True)
+        response = self._delete_account()
         
         # Should redirect to login page
-        self.assertIn('/login/', response.redirect_chain[-1][0])
+        self.assertIn('/login/', response.url)
         
         # Should show success message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any('successfully deleted' in str(msg).lower() for msg in messages))
         
         # User should be deactivated
@@ -720,23 +699,20 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_delete_account_clears_profile_data(self):
         """Test that account deletion clears profile data"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
-        
-        # Create profile with data
-        profile = user_profile_service.get_or_create_profile(self.user)
-        profile.phone_number = '1234567890'
-        profile.company_name = 'Test Company'
-        profile.facebook_connected = True
-        profile.google_connected = True
-        profile.save()
+        self.client.force_login(self.user)
+        
+        # Fill in the profile
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            phone_number='1234567890',
+            company_name='Test Company',
+            facebook_connected=True,
+            google_connected=True
+        )
         
         user_id = self.user.id
         
         # Delete account
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        response = self._delete_account()
         
         # Profile data should be cleared
         profile = UserProfile.objects.get(user_id=user_id)
@@ -748,58 +724,53 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_delete_account_deletes_profile_picture_file(self):
         """Test that account deletion removes profile picture file"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Create profile with picture
         profile = user_profile_service.get_or_create_profile(self.user)
-        test_image = self.create_test_image()
+        test_image = make_png_upload('test_image.png')
         
         # Upload profile picture
         success, error = user_profile_service.upload_profile_picture(
             self.user,
             test_image
         )
+        self.assertTrue(success, error)
         
-        profile.refresh_from_db()
-        had_picture = bool(profile.profile_picture)
+        profile.refresh_from_db(fields=['profile_picture'])
+        storage = profile.profile_picture.storage
+        picture_name = profile.profile_picture.name
+        self.assertTrue(storage.exists(picture_name))
         
         # Delete account
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        self._delete_account()
         
-        # Profile picture should be cleared
-        profile.refresh_from_db()
+        # Profile picture should be cleared and its file removed
+        profile.refresh_from_db(fields=['profile_picture'])
         self.assertFalse(profile.profile_picture)
+        self.assertFalse(storage.exists(picture_name))
     
     def test_delete_account_logs_out_user(self):
         """Test that account deletion logs out the user"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Verify user is logged in
         self.assertIn('_auth_user_id', self.client.session)
         
         # Delete account
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        response = self._delete_account()
         
         # User should be logged out
         self.assertNotIn('_auth_user_id', self.client.session)
     
     def test_delete_account_prevents_login_after_deletion(self):
         """Test that deleted account cannot be used to login"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         original_password = 'testpass123'
         
         # Delete account
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        response = self._delete_account()
         
         # Try to login with original credentials
         login_successful = self.client.login(
@@ -812,12 +783,7 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_delete_account_retains_invoice_data(self):
         """Test that account deletion retains invoice data for audit purposes"""
-        from invoice_processor.models import Invoice
-        from decimal import Decimal
-        from datetime import date
-        
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Create an invoice for the user
         invoice = Invoice.objects.create(
@@ -835,53 +801,38 @@ class SettingsPageIntegrationTests(TestCase):
         user_id = self.user.id
         
         # Delete account
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
-        
-        # Invoice should still exist
-        self.assertTrue(Invoice.objects.filter(id=invoice_id).exists())
-        
-        # Invoice should still be linked to the user (even though user is deactivated)
-        invoice = Invoice.objects.get(id=invoice_id)
-        self.assertEqual(invoice.uploaded_by.id, user_id)
-    
-    def test_delete_account_confirmation_case_insensitive(self):
-        """Test that confirmation text is case-insensitive"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
-        
-        user_id = self.user.id
-        
-        # Delete with different case
-        response = self.client.post(delete_url, {
-            'confirmation': 'DELETE MY ACCOUNT'
-        })
-        
-        # Should succeed
-        deleted_user = User.objects.get(id=user_id)
-        self.assertFalse(deleted_user.is_active)
-    
-    def test_delete_account_trims_whitespace_in_confirmation(self):
-        """Test that whitespace is trimmed from confirmation text"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
-        
-        user_id = self.user.id
-        
-        # Delete with whitespace
-        response = self.client.post(delete_url, {
-            'confirmation': '  delete my account  '
-        })
-        
-        # Should succeed
-        deleted_user = User.objects.get(id=user_id)
-        self.assertFalse(deleted_user.is_active)
+        response = self._delete_account()
+        
+        # Invoice should still exist and be linked to the user (even though
+        # user is deactivated); a single lookup covers both
+        uploaded_by_ids = Invoice.objects.filter(id=invoice_id).values_list('uploaded_by_id', flat=True)
+        self.assertEqual(list(uploaded_by_ids), [user_id])
+    
+    def test_delete_account_confirmation_variants(self):
+        """Test that confirmation text is case-insensitive and whitespace-trimmed"""
+        variants = ['DELETE MY ACCOUNT', '  delete my account  ']
+        # Each variant needs an account that is still active, so every
+        # sub-test deletes its own password-less user
+        users = []
+        for index in range(len(variants)):
+            user = User(username=f'variantuser{index}', email=f'variant{index}@example.com')
+            user.set_unusable_password()
+            users.append(user)
+        User.objects.bulk_create(users)
+        
+        for user, confirmation in zip(users, variants):
+            with self.subTest(confirmation=confirmation):
+                self.client.force_login(user)
+                
+                self._delete_account(confirmation)
+                
+                # Should succeed
+                user.refresh_from_db(fields=['is_active'])
+                self.assertFalse(user.is_active)
     
     def test_delete_account_handles_missing_profile(self):
         """Test that account deletion handles missing profile gracefully"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Delete profile if exists
         UserProfile.objects.filter(user=self.user).delete()
@@ -889,9 +840,7 @@ class SettingsPageIntegrationTests(TestCase):
         user_id = self.user.id
         
         # Delete account should still work
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        response = self._delete_account()
         
         # Should succeed
         deleted_user = User.objects.get(id=user_id)
@@ -899,8 +848,7 @@ class SettingsPageIntegrationTests(TestCase):
     
     def test_delete_account_transaction_rollback_on_error(self):
         """Test that account deletion rolls back on error"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         original_username = self.user.username
         original_email = self.user.email
@@ -924,91 +872,97 @@ class SettingsPageIntegrationTests(TestCase):
             password='testpass123'
         )
         
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Delete first user's account
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        response = self._delete_account()
         
         # First user should be deactivated
-        self.user.refresh_from_db()
+        self.user.refresh_from_db(fields=['is_active'])
         self.assertFalse(self.user.is_active)
         
         # Other user should be unaffected
-        other_user.refresh_from_db()
+        other_user.refresh_from_db(fields=['is_active', 'username', 'email'])
         self.assertTrue(other_user.is_active)
         self.assertEqual(other_user.username, 'otheruser')
         self.assertEqual(other_user.email, 'other@example.com')
     
     def test_delete_account_redirects_to_login_with_message(self):
         """Test that account deletion redirects to login with success message"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # Delete account
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        }, follow=True)
+        response = self._delete_account()
         
         # Should redirect to login
-        self.assertEqual(response.status_code, 200)
-        self.assertIn('/login/', response.redirect_chain[-1][0])
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/login/', response.url)
         
         # Should show success message
-        messages = list(response.context['messages'])
+        messages = list(get_messages(response.wsgi_request))
         self.assertTrue(len(messages) > 0)
         self.assertTrue(any('successfully deleted' in str(msg).lower() for msg in messages))
     
     def test_delete_account_error_handling(self):
         """Test that errors during account deletion are handled gracefully"""
-        self.client.login(username='testuser', password='testpass123')
-        delete_url = reverse('delete_account')
+        self.client.force_login(self.user)
         
         # This test ensures the view has proper error handling
         # In a real scenario, we would mock a database error
         # For now, we verify the basic flow works
         
-        response = self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        response = self._delete_account()
         
         # Should complete without raising exceptions
         self.assertIn(response.status_code, [200, 302])
     
     def test_delete_account_generates_unique_deleted_username(self):
         """Test that deleted usernames are unique"""
-        # Create two users
-        user1 = User.objects.create_user(
-            username='user1',
-            email='user1@example.com',
-            password='testpass123'
-        )
-        user2 = User.objects.create_user(
-            username='user2',
-            email='user2@example.com',
-            password='testpass123'
-        )
-        
-        delete_url = reverse('delete_account')
+        # Create two users in one INSERT; they are only ever logged in with
+        # force_login, so they need no password
+        user1 = User(username='user1', email='user1@example.com')
+        user2 = User(username='user2', email='user2@example.com')
+        user1.set_unusable_password()
+        user2.set_unusable_password()
+        User.objects.bulk_create([user1, user2])
         
         # Delete first user
-        self.client.login(username='user1', password='testpass123')
-        self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        self.client.force_login(user1)
+        self._delete_account()
         
         # Delete second user
-        self.client.login(username='user2', password='testpass123')
-        self.client.post(delete_url, {
-            'confirmation': 'delete my account'
-        })
+        self.client.force_login(user2)
+        self._delete_account()
         
         # Both users should have unique deleted usernames
-        user1.refresh_from_db()
-        user2.refresh_from_db()
+        user1.refresh_from_db(fields=['username'])
+        user2.refresh_from_db(fields=['username'])
         
         self.assertNotEqual(user1.username, user2.username)
         self.assertTrue(user1.username.startswith('deleted_'))
         self.assertTrue(user2.username.startswith('deleted_'))
+    
+    def test_delete_account_query_count(self):
+        """Test that account deletion runs a fixed number of queries"""
+        # Retained invoices must not add a query each
+        Invoice.objects.bulk_create([
+            Invoice(
+                invoice_id=f'TEST-{number:03d}',
+                invoice_date=date.today(),
+                vendor_name='Test Vendor',
+                grand_total=Decimal('1000.00'),
+                uploaded_by=self.user,
+                status='CLEARED'
+            )
+            for number in range(3)
+        ])
+        self.client.force_login(self.user)
+        
+        # Session, user, profile, savepoint, one UPDATE per table, release,
+        # then the session lookup and DELETE from logout
+        with self.assertNumQueries(9):
+            response = self._delete_account()
+        
+        # The pinned count only holds if the deletion actually went through
+        self.assertIn('/login/', response.url)
+        self.assertFalse(User.objects.get(pk=self.user.pk).is_active)
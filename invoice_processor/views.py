@@ -66,11 +66,16 @@ def dashboard(request):
     days_filter = max(5, min(14, days_filter))  # Clamp between 5 and 14
     
     # Calculate key metrics
-    # 1. Invoices Awaiting Verification
-    invoices_awaiting_verification = Invoice.objects.filter(
-        uploaded_by=request.user,
-        gst_verification_status='PENDING'
-    ).count()
+    # 1. Invoices Awaiting Verification and 3. Total Amount Processed,
+    # both computed in one pass over the user's invoices
+    invoice_metrics = Invoice.objects.filter(
+        uploaded_by=request.user
+    ).aggregate(
+        awaiting=Count('id', filter=Q(gst_verification_status='PENDING')),
+        total=Sum('grand_total'),
+    )
+    invoices_awaiting_verification = invoice_metrics['awaiting']
+    total_amount = invoice_metrics['total'] or Decimal('0')
     
     # 2. Anomalies Found This Week
     one_week_ago = timezone.now() - timedelta(days=7)
@@ -79,28 +84,24 @@ def dashboard(request):
         created_at__gte=one_week_ago
     ).count()
     
-    # 3. Total Amount Processed
-    total_amount = Invoice.objects.filter(
-        uploaded_by=request.user
-    ).aggregate(total=Sum('grand_total'))['total'] or Decimal('0')
-    
     # Anomaly breakdown for donut chart
     anomaly_breakdown = ComplianceFlag.objects.filter(
         invoice__uploaded_by=request.user
     ).values('flag_type').annotate(count=Count('id')).order_by('-count')
     
     # Recent activity - 5 most recently processed invoices
-    # Optimized with select_related for health_score
+    # The template only reads invoice columns, so no related rows are loaded
     recent_invoices = Invoice.objects.filter(
         uploaded_by=request.user
-    ).select_related('health_score').order_by('-uploaded_at')[:5]
+    ).order_by('-uploaded_at')[:5]
     
     # Suspected invoices - top 5 invoices with Critical compliance flags
-    # Optimized with select_related and prefetch_related
+    # The critical flag count is annotated in the same query, so the flags
+    # themselves are not prefetched
     suspected_invoices = Invoice.objects.filter(
         uploaded_by=request.user,
         compliance_flags__severity='CRITICAL'
-    ).select_related('health_score').prefetch_related('compliance_flags').annotate(
+    ).annotate(
         critical_flags_count=Count('compliance_flags', filter=Q(compliance_flags__severity='CRITICAL'))
     ).order_by('-critical_flags_count', '-uploaded_at')[:5]
     
@@ -165,19 +166,20 @@ def dashboard_analytics_api(request):
         
         # Get metrics
         one_week_ago = timezone.now() - timedelta(days=7)
-        invoices_awaiting_verification = Invoice.objects.filter(
-            uploaded_by=request.user,
-            gst_verification_status='PENDING'
-        ).count()
+        invoice_metrics = Invoice.objects.filter(
+            uploaded_by=request.user
+        ).aggregate(
+            awaiting=Count('id', filter=Q(gst_verification_status='PENDING')),
+            total=Sum('grand_total'),
+        )
+        invoices_awaiting_verification = invoice_metrics['awaiting']
         
         anomalies_this_week = ComplianceFlag.objects.filter(
             invoice__uploaded_by=request.user,
             invoice__uploaded_at__gte=one_week_ago
         ).count()
         
-        total_amount = Invoice.objects.filter(
-            uploaded_by=request.user
-        ).aggregate(total=Sum('grand_total'))['total'] or 0
+        total_amount = invoice_metrics['total'] or 0
         
         return JsonResponse({
             'success': True,
@@ -1376,8 +1378,8 @@ def submit_manual_entry(request, invoice_id):
             invoice.line_items.all().delete()
             
             # Create line items
-            for item_data in line_items:
-                LineItem.objects.create(
+            LineItem.objects.bulk_create([
+                LineItem(
                     invoice=invoice,
                     description=item_data['description'],
                     normalized_key=normalize_product_key(item_data['description']),
@@ -1387,6 +1389,8 @@ def submit_manual_entry(request, invoice_id):
                     billed_gst_rate=Decimal(str(item_data['billed_gst_rate'])),
                     line_total=Decimal(str(item_data['line_total']))
                 )
+                for item_data in line_items
+            ])
             
             logger.info(f"Manual entry completed for invoice {invoice.id}")
             
@@ -1409,7 +1413,7 @@ def submit_manual_entry(request, invoice_id):
                 for flag in compliance_flags:
                     if not flag.invoice_id:
                         flag.invoice = invoice
-                    flag.save()
+                ComplianceFlag.objects.bulk_create(compliance_flags)
                 
                 # Update invoice status based on flags
                 critical_flags = [f for f in compliance_flags if f.severity == 'CRITICAL']
@@ -1661,8 +1665,13 @@ def settings(request):
     Comprehensive settings page for managing account, preferences, and connected services
     Requirements: 10.1, 10.2, 10.3, 10.4, 10.5, 10.6
     """
+    from django.contrib.auth.models import User
     from .services.user_profile_service import user_profile_service
     
+    # Reload the user with its profile joined in so the profile and the
+    # template's profile picture need no separate query
+    request.user = User.objects.select_related('profile').get(pk=request.user.pk)
+    
     # Get or create user profile
     profile = user_profile_service.get_or_create_profile(request.user)
     
@@ -1722,7 +1731,13 @@ def settings(request):
             profile.enable_animations = 'enable_animations' in request.POST
             profile.enable_notifications = 'enable_notifications' in request.POST
             
-            profile.save()
+            # Write only the settings fields so a picture or contact details
+            # saved elsewhere are never overwritten from this copy
+            profile.save(update_fields=[
+                'facebook_connected', 'google_connected',
+                'enable_sound_effects', 'enable_animations', 'enable_notifications',
+                'updated_at',
+            ])
             
             messages.success(request, 'Settings updated successfully!')
             return redirect('settings')
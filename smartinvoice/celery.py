@@ -63,7 +63,7 @@ app.conf.update(
             'queue': 'invoices',
             'priority': 5,
         },
-        'invoice_processor.tasks.process_batch_invoices': {
+        'invoice_processor.process_invoice_batch_async': {
             'queue': 'invoices',
             'priority': 3,
         },